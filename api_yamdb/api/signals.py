@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.v1.autocomplete import KINDS, SOURCES, autocomplete_index
+from api.v1.cache import invalidate
+from api.v1.user_cache import user_cache
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import bulk_created
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    invalidate('titles', f'reviews:{instance.pk}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, **kwargs):
+    invalidate('titles')
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    invalidate('categories', 'titles')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genre(sender, instance, **kwargs):
+    invalidate('genres', 'titles')
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    invalidate(
+        'titles', f'reviews:{instance.title_id}', f'comments:{instance.pk}'
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    invalidate(f'comments:{instance.review_id}')
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_renamed_author(sender, instance, created, **kwargs):
+    """Имя автора выводится в отзывах и комментариях."""
+    if created or not getattr(instance, '_username_changed', False):
+        return
+    title_ids = Review.objects.filter(author=instance).values_list(
+        'title_id', flat=True
+    ).distinct()
+    review_ids = Comment.objects.filter(author=instance).values_list(
+        'review_id', flat=True
+    ).distinct()
+    invalidate(
+        *(f'reviews:{title_id}' for title_id in title_ids),
+        *(f'comments:{review_id}' for review_id in review_ids)
+    )
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def update_autocomplete(sender, instance, **kwargs):
+    kind = KINDS[sender]
+    value = getattr(instance, SOURCES[kind][1])
+    transaction.on_commit(lambda: autocomplete_index.update(
+        kind, instance.pk, instance.name, value
+    ))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    kind, pk = KINDS[sender], instance.pk
+    transaction.on_commit(lambda: autocomplete_index.remove(kind, pk))
+
+
+@receiver(bulk_created, sender=Title)
+@receiver(bulk_created, sender=Genre)
+@receiver(bulk_created, sender=Category)
+def invalidate_bulk_created(sender, objects, **kwargs):
+    # Тег кеша списков совпадает с видом подсказок: titles, genres...
+    invalidate(KINDS[sender])
+
+
+@receiver(bulk_created, sender=Title)
+@receiver(bulk_created, sender=Genre)
+@receiver(bulk_created, sender=Category)
+def add_bulk_created_to_autocomplete(sender, objects, **kwargs):
+    kind = KINDS[sender]
+    entries = [
+        (obj.pk, obj.name, getattr(obj, SOURCES[kind][1])) for obj in objects
+    ]
+
+    def update():
+        for pk, name, value in entries:
+            autocomplete_index.update(kind, pk, name, value)
+
+    transaction.on_commit(update)
@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .user_cache import user_cache
+
+User = get_user_model()
+
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+VERSION_CLAIM = 'ver'
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен, в котором есть все нужное для проверки прав."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+def get_active_user(user_id):
+    """Активный пользователь из кеша пользователей или None."""
+    user = user_cache.get(user_id)
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без загрузки пользователя из БД.
+
+    Для токенов RoleAccessToken права берутся из claims, а актуальность
+    токена проверяется по версии из кеша пользователей. Имя берется из
+    того же кеша: оно меняется без отзыва токенов и не хранится в них.
+    Для токенов без этих claims пользователь берется из того же кеша.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Токен не содержит идентификатор пользователя')
+        if ROLE_CLAIM not in validated_token:
+            return self.get_cached_user(user_id)
+
+        cached = get_active_user(user_id)
+        if cached is None or (
+            cached.token_version != validated_token.get(VERSION_CLAIM)
+        ):
+            raise AuthenticationFailed(
+                'Токен отозван.', code='token_revoked'
+            )
+
+        user = User(
+            id=user_id,
+            username=cached.username,
+            role=validated_token[ROLE_CLAIM],
+            is_superuser=validated_token[SUPERUSER_CLAIM],
+            token_version=cached.token_version,
+        )
+        user._state.adding = False
+        return user
+
+    def get_cached_user(self, user_id):
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found'
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь заблокирован.', code='user_inactive'
+            )
+        return user
@@ -0,0 +1,184 @@
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+
+from reviews.models import Category, Genre, Title
+
+# Тип подсказки: модель и поле, по которому объект адресуется в API.
+SOURCES = {
+    'titles': (Title, 'id'),
+    'genres': (Genre, 'slug'),
+    'categories': (Category, 'slug'),
+}
+KINDS = {model: kind for kind, (model, _) in SOURCES.items()}
+
+_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def get_words(text):
+    return set(re.findall(r'\w+', text.lower()))
+
+
+class AutocompleteIndex:
+    """Префиксный индекс названий произведений, жанров и категорий.
+
+    Слова названий каждого типа хранятся в отдельном отсортированном
+    списке, поэтому поиск по префиксу — это бинарный поиск и проход по
+    соседним элементам. Индекс строится из БД при первом обращении,
+    обновляется сигналами и раз в AUTOCOMPLETE_REBUILD_INTERVAL
+    пересобирается в фоновом потоке, чтобы подхватить изменения из других
+    процессов; пока идет пересборка, запросы обслуживает прежний индекс.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Индекс строит только один поток одновременно.
+        self.build_lock = threading.Lock()
+        self.rebuild = None
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            # Тип -> отсортированный список (слово, pk).
+            self.words = {kind: [] for kind in SOURCES}
+            # (тип, pk) -> (название, значение для адресации в API).
+            self.entries = {}
+            self.built_at = None
+            # Изменения, пришедшие во время чтения индекса из БД.
+            self.pending = None
+
+    def load(self):
+        entries = {}
+        words = {kind: [] for kind in SOURCES}
+        for kind, (model, lookup) in SOURCES.items():
+            for pk, name, value in model.objects.values_list(
+                'pk', 'name', lookup
+            ).iterator():
+                entries[(kind, pk)] = (name, value)
+                words[kind].extend((word, pk) for word in get_words(name))
+        for kind_words in words.values():
+            kind_words.sort()
+        return words, entries
+
+    def build(self):
+        """Строит индекс из БД.
+
+        Изменения, пришедшие от сигналов во время чтения, применяются
+        поверх прочитанного, чтобы не потеряться при замене индекса.
+        """
+        with self.lock:
+            self.pending = []
+        try:
+            words, entries = self.load()
+        finally:
+            with self.lock:
+                pending, self.pending = self.pending or [], None
+        with self.lock:
+            self.words = words
+            self.entries = entries
+            for change in pending:
+                self._apply(*change)
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self.built_at is None:
+            with self.build_lock:
+                if self.built_at is None:
+                    self.build()
+        elif time.monotonic() - self.built_at > (
+            settings.AUTOCOMPLETE_REBUILD_INTERVAL
+        ) and self.build_lock.acquire(blocking=False):
+            self.rebuild = _executor.submit(self._rebuild_in_thread)
+
+    def _rebuild_in_thread(self):
+        try:
+            self.build()
+        finally:
+            self.build_lock.release()
+            connection.close()
+
+    def update(self, kind, pk, name, value):
+        self._change(kind, pk, (name, value))
+
+    def remove(self, kind, pk):
+        self._change(kind, pk, None)
+
+    def _change(self, kind, pk, entry):
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((kind, pk, entry))
+            if self.built_at is not None:
+                self._apply(kind, pk, entry)
+
+    def _apply(self, kind, pk, entry):
+        previous = self.entries.pop((kind, pk), None)
+        words = self.words[kind]
+        if previous is not None:
+            for word in get_words(previous[0]):
+                position = bisect_left(words, (word, pk))
+                if words[position:position + 1] == [(word, pk)]:
+                    del words[position]
+        if entry is not None:
+            self.entries[(kind, pk)] = entry
+            for word in get_words(entry[0]):
+                insort(words, (word, pk))
+
+    def search(self, query, limit, kind=None):
+        """Лучшие совпадения: каждое слово запроса — начало слова названия.
+
+        Выше стоят названия, которые начинаются с запроса, затем более
+        короткие. Для каждого типа просматривается не больше
+        AUTOCOMPLETE_MAX_CANDIDATES слов, поэтому время ответа не зависит
+        от размера каталога.
+        """
+        tokens = re.findall(r'\w+', query.lower())
+        if not tokens:
+            return []
+        self.ensure_built()
+        longest = max(tokens, key=len)
+        query = ' '.join(tokens)
+        candidates = set()
+        with self.lock:
+            for word_kind in (kind,) if kind else SOURCES:
+                words = self.words[word_kind]
+                position = bisect_left(words, (longest,))
+                end = min(
+                    len(words),
+                    position + settings.AUTOCOMPLETE_MAX_CANDIDATES
+                )
+                for word, pk in words[position:end]:
+                    if not word.startswith(longest):
+                        break
+                    candidates.add((word_kind, pk))
+            matches = [
+                (word_kind, *self.entries[(word_kind, pk)])
+                for word_kind, pk in candidates
+            ]
+        matches = [
+            (word_kind, name, value)
+            for word_kind, name, value in matches
+            if all(
+                any(word.startswith(token) for word in get_words(name))
+                for token in tokens
+            )
+        ]
+        return [
+            {'type': word_kind, 'name': name, SOURCES[word_kind][1]: value}
+            for word_kind, name, value in heapq.nsmallest(
+                limit, matches,
+                key=lambda match: (
+                    not match[1].lower().startswith(query),
+                    len(match[1]),
+                    match[1],
+                )
+            )
+        ]
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.encoding import smart_str
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.relations import ManyRelatedField
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+from reviews.signals import bulk_created
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который при пакетной проверке не ходит в БД.
+
+    BulkListSerializer заранее загружает все упомянутые в пакете объекты
+    одним запросом и кладет их в `prefetched`.
+    """
+
+    prefetched = None
+
+    def to_internal_value(self, data):
+        if self.prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return self.prefetched[smart_str(data)]
+        except KeyError:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+
+
+class BatchUniqueValidator:
+    """Проверка уникальности по множеству значений, загруженному заранее.
+
+    Значение, встреченное в пакете, добавляется в множество, поэтому
+    повтор внутри пакета тоже считается ошибкой.
+    """
+
+    def __init__(self, existing, message):
+        self.existing = existing
+        self.message = message
+
+    def __call__(self, value):
+        if value in self.existing:
+            raise serializers.ValidationError(self.message, code='unique')
+        self.existing.add(value)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Список объектов для пакетного создания.
+
+    Все элементы проверяются за один проход: связанные объекты по слагам
+    и занятые значения уникальных полей загружаются одним запросом на
+    поле для всего пакета, а не запросом на элемент.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            items = [item for item in data if isinstance(item, dict)]
+            for name, field in self.child.fields.items():
+                if field.read_only:
+                    continue
+                self.prefetch_slugs(name, field, items)
+                self.prefetch_unique(name, field, items)
+        return super().to_internal_value(data)
+
+    def prefetch_slugs(self, name, field, items):
+        many = isinstance(field, ManyRelatedField)
+        relation = field.child_relation if many else field
+        if not isinstance(relation, PrefetchedSlugRelatedField):
+            return
+        slugs = set()
+        for item in items:
+            value = item.get(name)
+            if many and isinstance(value, list):
+                slugs.update(smart_str(slug) for slug in value)
+            elif not many and value is not None:
+                slugs.add(smart_str(value))
+        relation.prefetched = {
+            getattr(obj, relation.slug_field): obj
+            for obj in relation.get_queryset().filter(**{
+                f'{relation.slug_field}__in': slugs
+            })
+        }
+
+    def prefetch_unique(self, name, field, items):
+        validators = []
+        for validator in field.validators:
+            if isinstance(validator, UniqueValidator):
+                lookup = field.source
+                values = {
+                    item[name] for item in items
+                    if isinstance(item.get(name), str)
+                }
+                existing = set(validator.queryset.filter(**{
+                    f'{lookup}__in': values
+                }).values_list(lookup, flat=True))
+                validator = BatchUniqueValidator(existing, validator.message)
+            validators.append(validator)
+        field.validators = validators
+
+
+class BulkCreateMixin:
+    """Пакетное создание объектов: POST на <список>/bulk/ с JSON-массивом.
+
+    Пакет проверяется целиком; при ошибках ответ 400 содержит список
+    ошибок по элементам в порядке запроса, и ничего не записывается.
+    Иначе объекты вставляются через bulk_create, связи многие-ко-многим —
+    одной вставкой в промежуточную таблицу, все в одной транзакции.
+    Размер пакета ограничен настройкой BULK_CREATE_MAX_SIZE.
+    """
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request):
+        serializer = BulkListSerializer(
+            child=self.get_serializer_class()(),
+            data=request.data,
+            context=self.get_serializer_context(),
+            allow_empty=False,
+            max_length=settings.BULK_CREATE_MAX_SIZE
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objects = self.perform_bulk_create(serializer)
+        return Response(
+            self.get_bulk_response_data(objects),
+            status=status.HTTP_201_CREATED
+        )
+
+    def perform_bulk_create(self, serializer):
+        model = serializer.child.Meta.model
+        relations = [field.name for field in model._meta.many_to_many]
+        objects, related = [], []
+        for attrs in serializer.validated_data:
+            attrs = dict(attrs)
+            related.append({
+                name: attrs.pop(name) for name in relations if name in attrs
+            })
+            objects.append(model(**attrs))
+        model.objects.bulk_create(objects)
+        for name in relations:
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            through.objects.bulk_create([
+                through(**{
+                    field.m2m_field_name(): obj,
+                    field.m2m_reverse_field_name(): target,
+                })
+                for obj, values in zip(objects, related)
+                for target in values.get(name, ())
+            ])
+        bulk_created.send(sender=model, objects=objects)
+        return objects
+
+    def get_bulk_response_data(self, objects):
+        return self.get_serializer(objects, many=True).data
@@ -0,0 +1,141 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, urlencode
+from rest_framework.response import Response
+
+VERSION_KEY = 'response-cache:version:{}'
+RESPONSE_KEY = 'response-cache:response:{}'
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+# Заголовки, которые сохраняются вместе с данными ответа.
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_tag_versions(tags):
+    """Возвращает текущие версии тегов, заводя недостающие.
+
+    Версия — случайная строка, а не счетчик: если ключ версии вытеснен
+    из кеша, новая версия не совпадет ни с одной из старых записей.
+    """
+    cache = get_response_cache()
+    keys = [VERSION_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*tags):
+    """Делает недействительными все ответы, помеченные тегами.
+
+    Версии меняются после фиксации транзакции: иначе запрос, пришедший
+    до нее, сохранил бы под новой версией еще старые данные.
+    """
+    versions = {VERSION_KEY.format(tag): uuid4().hex for tag in tags}
+    transaction.on_commit(
+        lambda: get_response_cache().set_many(versions, None)
+    )
+
+
+def increment(key):
+    cache = get_response_cache()
+    if not cache.add(key, 1, None):
+        cache.incr(key)
+
+
+def get_stats():
+    stats = get_response_cache().get_many((HITS_KEY, MISSES_KEY))
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else None,
+    }
+
+
+class ResponseCacheMixin:
+    """Кеширует GET-ответы вьюсета для анонимных пользователей.
+
+    Ключ строится из адреса, отсортированных query-параметров и версий
+    тегов из `cache_tags`. Теги форматируются kwargs из URL, например
+    'reviews:{title_id}', и сбрасываются сигналами из api.signals.
+
+    Вместе с данными сохраняются ETag и Last-Modified ответа, поэтому
+    попадание в кеш отвечает 200 или 304 без запросов к БД. Миксин
+    должен стоять в MRO раньше миксинов условных запросов.
+    """
+
+    cache_tags = ()
+
+    def get_cache_tags(self):
+        return [tag.format(**self.kwargs) for tag in self.cache_tags]
+
+    def get_response_cache_key(self, request):
+        query = urlencode(sorted(
+            (param, sorted(values))
+            for param, values in request.query_params.lists()
+        ), doseq=True)
+        versions = ':'.join(get_tag_versions(self.get_cache_tags()))
+        key = f'{request.build_absolute_uri(request.path)}?{query}#{versions}'
+        return RESPONSE_KEY.format(md5(key.encode()).hexdigest())
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        cache = get_response_cache()
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            increment(HITS_KEY)
+            data, headers = cached
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    headers.get('Last-Modified', '')
+                )
+            )
+            if response is None:
+                response = Response(data, headers=headers)
+            response['X-Cache'] = 'HIT'
+            return response
+        increment(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {
+                header: response[header]
+                for header in CACHED_HEADERS if header in response
+            }
+            cache.set(
+                key, (response.data, headers),
+                settings.RESPONSE_CACHE_TIMEOUT
+            )
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(ResponseCacheMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
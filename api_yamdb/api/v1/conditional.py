@@ -0,0 +1,137 @@
+from datetime import datetime
+from hashlib import md5
+from itertools import chain
+
+from django.db.models import Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """Отдает ETag и Last-Modified и отвечает 304 без сериализации.
+
+    Валидаторы строятся из уже поддерживаемых версий, без COUNT по всей
+    выборке: дат изменения `updated_field` объекта, родителя или объектов
+    текущей страницы. Дополнительные версии, от которых зависит ответ,
+    возвращает `get_extra_versions`.
+    """
+
+    updated_field = 'updated_at'
+
+    def get_extra_versions(self):
+        return ()
+
+    def get_last_modified(self, versions):
+        return max(
+            (value for value in versions if isinstance(value, datetime)),
+            default=None
+        )
+
+    def get_validators(self, request, versions):
+        versions = (*versions, *self.get_extra_versions())
+        last_modified = self.get_last_modified(versions)
+        fingerprint = '|'.join((
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            *(
+                value.isoformat() if isinstance(value, datetime)
+                else str(value)
+                for value in versions
+            ),
+        ))
+        etag = f'"{md5(fingerprint.encode()).hexdigest()}"'
+        return etag, last_modified
+
+    def get_conditional_response(self, handler, versions, request, *args,
+                                 **kwargs):
+        etag, last_modified = self.get_validators(request, versions)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Валидаторы списка без отдельных запросов к БД.
+
+    Для вложенных списков это дата изменения родителя (она сдвигается
+    при создании и удалении дочерних объектов) и последняя дата
+    изменения дочернего объекта: оба значения берутся запросом родителя
+    по индексу (родитель, updated_at). Для остальных — count пагинатора,
+    который уже ограничен или закеширован, и id и даты объектов
+    страницы. Страница загружается один раз и переиспользуется ответом.
+
+    Last-Modified отдается только вложенным спискам: удаление объекта
+    сдвигает дату родителя, а максимум дат страницы от удаления не
+    меняется, и клиент с одним If-Modified-Since получил бы 304.
+    """
+
+    def get_last_modified(self, versions):
+        if self.action == 'list' and getattr(
+            self, 'parent_model', None
+        ) is None:
+            return None
+        return super().get_last_modified(versions)
+
+    def get_list_versions(self, queryset):
+        if getattr(self, 'parent_model', None) is not None:
+            return self.get_parent_versions(queryset)
+        return self.get_page_versions(queryset)
+
+    def get_parent_versions(self, queryset):
+        latest = queryset.order_by(f'-{self.updated_field}').values(
+            self.updated_field
+        )[:1]
+        parent = self.get_parent(latest_child_update=Subquery(latest))
+        return parent.updated_at, parent.latest_child_update
+
+    def get_page_versions(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return tuple(chain.from_iterable(
+                queryset.select_related(None).prefetch_related(
+                    None
+                ).values_list('pk', self.updated_field)
+            ))
+        return (self.paginator.page.paginator.count, *chain.from_iterable(
+            (obj.pk, getattr(obj, self.updated_field)) for obj in page
+        ))
+
+    def paginate_queryset(self, queryset):
+        if not hasattr(self, '_page'):
+            self._page = super().paginate_queryset(queryset)
+        return self._page
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list,
+            self.get_list_versions(self.filter_queryset(self.get_queryset())),
+            request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Валидаторы объекта из его даты изменения.
+
+    Объект загружается один раз и переиспользуется ответом.
+    """
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve,
+            (getattr(self.get_object(), self.updated_field),),
+            request, *args, **kwargs
+        )
@@ -1,6 +1,24 @@
 import django_filters
+from django_filters.constants import EMPTY_VALUES
 
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class StableOrderingFilter(django_filters.OrderingFilter):
+    """Сортировка, дополненная id в том же направлении.
+
+    Так страницы не пересекаются при равных значениях, а запрос
+    читается по составному индексу (поле, id) без дополнительной
+    сортировки.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        ordering = [self.get_ordering_value(param) for param in value]
+        tie_breaker = '-id' if ordering[0].startswith('-') else 'id'
+        return qs.order_by(*ordering, tie_breaker)
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -10,7 +28,31 @@ class TitleFilter(django_filters.FilterSet):
         field_name='name',
         lookup_expr='icontains'
     )
+    rating_min = django_filters.NumberFilter(
+        field_name='rating', lookup_expr='gte'
+    )
+    rating_max = django_filters.NumberFilter(
+        field_name='rating', lookup_expr='lte'
+    )
+    reviews_min = django_filters.NumberFilter(
+        field_name='rating_count', lookup_expr='gte'
+    )
+    search = django_filters.CharFilter(method='filter_search')
+    # Объявлена последней: явная сортировка заменяет порядок поиска.
+    ordering = StableOrderingFilter(fields=(
+        ('rating', 'rating'),
+        ('rating_count', 'review_count'),
+        ('year', 'year'),
+        ('name', 'name'),
+    ))
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'name', 'year')
+        fields = (
+            'category', 'genre', 'name', 'year', 'rating_min', 'rating_max',
+            'reviews_min', 'search', 'ordering'
+        )
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск с сортировкой по релевантности."""
+        return search_titles(queryset, value)
@@ -0,0 +1,95 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+COUNT_CACHE_KEY = 'pagination-count:{}'
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который не пересчитывает COUNT(*) больших выборок.
+
+    Небольшие выборки считаются точно запросом с LIMIT. Для больших
+    точное значение считается один раз и затем отдается из кеша по
+    ключу SQL-запроса, пока не истечет таймаут.
+    """
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        threshold = settings.EXACT_COUNT_THRESHOLD
+        # Порядок не влияет на количество, а без него СУБД может
+        # выбрать индекс по условиям фильтра.
+        unordered = self.object_list.order_by()
+        exact_count = unordered[:threshold + 1].count()
+        if exact_count <= threshold:
+            return exact_count
+        key = COUNT_CACHE_KEY.format(
+            md5(str(unordered.query).encode()).hexdigest()
+        )
+        count = cache.get(key)
+        if count is not None:
+            self.count_is_estimate = True
+            return count
+        count = unordered.count()
+        cache.set(key, count, settings.ESTIMATED_COUNT_TIMEOUT)
+        return count
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Постраничная пагинация с признаком приблизительного count."""
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_is_estimate'] = (
+            self.page.paginator.count_is_estimate
+        )
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_is_estimate'] = {'type': 'boolean'}
+        return schema
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация по (pub_date, id) без COUNT и OFFSET."""
+
+    ordering = ('-pub_date', '-id')
+
+
+class CursorOptInPagination(EstimatedCountPagination):
+    """Постраничная пагинация с переключением на курсорную по ?cursor=.
+
+    Без параметра `cursor` ответ совпадает с EstimatedCountPagination.
+    С ним (в том числе пустым) страницы отдаются курсорной пагинацией,
+    и стоимость любой страницы равна стоимости первой.
+    """
+
+    cursor_pagination_class = PubDateCursorPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return self.cursor_paginator.get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is None:
+            return super().get_html_context()
+        return self.cursor_paginator.get_html_context()
@@ -6,7 +6,7 @@ class IsAuthorOrModeratorOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.pk
             or request.user.is_moderator
             or request.user.is_admin
         )
@@ -40,7 +40,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             request.method in permissions.SAFE_METHODS
             or (
                 request.user.is_authenticated and (
-                    obj.author == request.user
+                    obj.author_id == request.user.pk
                     or request.user.is_moderator
                     or request.user.is_admin
                 )
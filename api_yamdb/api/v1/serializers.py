@@ -1,12 +1,19 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from reviews.leaderboards import METRIC_RATING, METRICS
+from reviews.ratings import get_bayesian_rating, get_histogram, get_prior_mean
 from reviews.validators import unicode_validator, validate_username_restricted
 from reviews.models import (
     Category, Comment, Genre, Review, Title,
-    MAX_USERNAME_LENGTH, MAX_EMAIL_LENGTH
+    MAX_NAME_FIELD_LENGTH, MAX_USERNAME_LENGTH, MAX_EMAIL_LENGTH
 )
+from .autocomplete import SOURCES
+from .bulk import PrefetchedSlugRelatedField
 
 User = get_user_model()
 
@@ -27,15 +34,18 @@ class SignupSerializer(serializers.Serializer):
         email = data.get('email')
         errors = {}
 
-        if User.objects.filter(
-            username=username
-        ).exclude(email=email).exists():
-            errors['username'] = 'Это имя уже занято другим пользователем.'
-
-        if User.objects.filter(
-            email=email
-        ).exclude(username=username).exists():
-            errors['email'] = 'Эта почта уже занята другим пользователем.'
+        conflicts = User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).exclude(username=username, email=email).values_list(
+            'username', 'email'
+        )[:2]
+        for taken_username, taken_email in conflicts:
+            if taken_username == username:
+                errors['username'] = (
+                    'Это имя уже занято другим пользователем.'
+                )
+            if taken_email == email:
+                errors['email'] = 'Эта почта уже занята другим пользователем.'
 
         if errors:
             raise serializers.ValidationError(errors)
@@ -84,11 +94,11 @@ class GenreSerializer(serializers.ModelSerializer):
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
+    category = PrefetchedSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
-    genre = serializers.SlugRelatedField(
+    genre = PrefetchedSlugRelatedField(
         slug_field='slug',
         many=True,
         queryset=Genre.objects.all()
@@ -101,20 +111,46 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         )
 
     def to_representation(self, instance):
-        return TitleReadSerializer(instance).data
+        return TitleDetailSerializer(instance).data
 
 
 class TitleReadSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
     rating = serializers.IntegerField(read_only=True, default=None)
+    review_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
+    rating_average = serializers.FloatField(source='rating', read_only=True)
+    bayesian_rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+            'id', 'name', 'year', 'rating', 'rating_average',
+            'bayesian_rating', 'review_count', 'description', 'genre',
+            'category'
         )
 
+    @cached_property
+    def prior_mean(self):
+        # При many=True сериализатор один на всю страницу.
+        return get_prior_mean()
+
+    def get_bayesian_rating(self, obj):
+        rating = get_bayesian_rating(obj, self.prior_mean)
+        return None if rating is None else round(rating, 2)
+
+
+class TitleDetailSerializer(TitleReadSerializer):
+    score_histogram = serializers.SerializerMethodField()
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('score_histogram',)
+
+    def get_score_histogram(self, obj):
+        return get_histogram(obj)
+
 
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
@@ -135,12 +171,65 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'pub_date', 'score')
 
-    def validate(self, attrs):
-        request = self.context.get('request')
-        if request.method != 'POST':
-            return attrs
-        user = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        if Review.objects.filter(author=user, title_id=title_id).exists():
-            raise ValidationError('Вы уже оставили отзыв на это произведение.')
-        return attrs
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=MAX_NAME_FIELD_LENGTH)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.AUTOCOMPLETE_MAX_LIMIT,
+        default=settings.AUTOCOMPLETE_LIMIT
+    )
+    type = serializers.ChoiceField(
+        choices=tuple(SOURCES), required=False
+    )
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    by = serializers.ChoiceField(choices=METRICS, default=METRIC_RATING)
+    genre = serializers.SlugField(required=False)
+    category = serializers.SlugField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.LEADERBOARD_SIZE,
+        default=settings.LEADERBOARD_SIZE
+    )
+
+    def validate(self, data):
+        if 'genre' in data and 'category' in data:
+            raise ValidationError(
+                'Укажите либо жанр, либо категорию.'
+            )
+        scope = 'all'
+        if 'genre' in data:
+            scope = f'genre:{data["genre"]}'
+        elif 'category' in data:
+            scope = f'category:{data["category"]}'
+        return {'metric': data['by'], 'scope': scope, 'limit': data['limit']}
+
+
+class IdListQuerySerializer(serializers.Serializer):
+    # Наибольшее значение целочисленного первичного ключа в БД.
+    MAX_ID = 2 ** 63 - 1
+
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(pk) for pk in value.split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError(
+                'Передайте id через запятую, например ?ids=1,2,3.'
+            )
+        if any(not 1 <= pk <= self.MAX_ID for pk in ids):
+            raise ValidationError(
+                f'id должны быть в диапазоне от 1 до {self.MAX_ID}.'
+            )
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise ValidationError('Передайте хотя бы один id.')
+        if len(ids) > settings.MULTI_GET_MAX_IDS:
+            raise ValidationError(
+                f'За один запрос можно получить не больше '
+                f'{settings.MULTI_GET_MAX_IDS} объектов.'
+            )
+        return ids
@@ -0,0 +1,109 @@
+from collections.abc import Mapping
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+RESEND_KEY = 'signup-resend:{}'
+
+
+def get_throttle_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def claim_resend_slot(email):
+    """Разрешает одно письмо на адрес за SIGNUP_RESEND_WINDOW секунд."""
+    return get_throttle_cache().add(
+        RESEND_KEY.format(md5(email.lower().encode()).hexdigest()),
+        True,
+        settings.SIGNUP_RESEND_WINDOW
+    )
+
+
+def get_data_value(request, field):
+    """Поле тела запроса или None, если тело не объект.
+
+    Троттлинг выполняется до сериализатора, который сам ответит 400 на
+    список или скаляр в теле.
+    """
+    if not isinstance(request.data, Mapping):
+        return None
+    return str(request.data.get(field, ''))
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение по алгоритму token bucket.
+
+    Ставка 'N/период' из DEFAULT_THROTTLE_RATES задает емкость ведра N,
+    которое равномерно пополняется за период. В отличие от окна
+    SimpleRateThrottle, хранится не история запросов, а пара
+    (токены, время), поэтому ключ стоит O(1) при любой ставке.
+    Хранилище — кеш THROTTLE_CACHE_ALIAS (в памяти или в БД).
+    """
+
+    @property
+    def cache(self):
+        return get_throttle_cache()
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {
+            'scope': self.scope, 'ident': md5(ident.encode()).hexdigest()
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, now))
+        self.tokens = min(
+            self.num_requests,
+            tokens + (now - updated) * self.num_requests / self.duration
+        )
+        if self.tokens < 1:
+            return self.throttle_failure()
+        self.cache.set(self.key, (self.tokens - 1, now), self.duration)
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignupEmailThrottle(TokenBucketThrottle):
+    scope = 'signup_email'
+
+    def get_ident_value(self, request):
+        email = get_data_value(request, 'email')
+        return email and email.lower()
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token_ip'
+
+
+class TokenUsernameThrottle(TokenBucketThrottle):
+    scope = 'token_username'
+
+    def get_ident_value(self, request):
+        return get_data_value(request, 'username')
@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    CategoryViewSet, CommentViewSet, GenreViewSet,
-    ReviewViewSet, SignupView, TitleViewSet,
+    AutocompleteView, CategoryViewSet, CommentViewSet, GenreViewSet,
+    ResponseCacheStatsView, ReviewViewSet, SignupView, TitleViewSet,
     TokenObtainView, UserViewSet
 )
 
@@ -26,5 +26,11 @@ router_v1.register(
 urlpatterns = [
     path('auth/signup/', SignupView.as_view(), name='signup'),
     path('auth/token/', TokenObtainView.as_view(), name='token_obtain'),
+    path(
+        'autocomplete/', AutocompleteView.as_view(), name='autocomplete'
+    ),
+    path(
+        'cache/stats/', ResponseCacheStatsView.as_view(), name='cache_stats'
+    ),
     path('', include(router_v1.urls)),
 ]
@@ -0,0 +1,80 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class UserCache:
+    """Ограниченный LRU-кеш пользователей процесса с временем жизни.
+
+    Наружу отдаются копии объектов, поэтому изменения в запросе не
+    попадают в кеш. Записи сбрасываются сигналами при сохранении и
+    удалении пользователя; в других процессах их актуальность
+    ограничена USER_CACHE_TIMEOUT.
+    """
+
+    def __init__(self):
+        self.users = OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        """Пользователь по id из кеша или из БД; None, если его нет."""
+        user_id = int(user_id)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is not None and entry[1] > now:
+                self.users.move_to_end(user_id)
+                self.hits += 1
+                return copy.copy(entry[0])
+            self.misses += 1
+            generation = self.generation
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            self.set(user, generation)
+        return user
+
+    def set(self, user, generation):
+        with self.lock:
+            # Пользователь изменился, пока мы читали его из БД.
+            if generation != self.generation:
+                return
+            self.users[user.pk] = (
+                copy.copy(user),
+                time.monotonic() + settings.USER_CACHE_TIMEOUT
+            )
+            self.users.move_to_end(user.pk)
+            while len(self.users) > settings.USER_CACHE_MAX_SIZE:
+                self.users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.generation += 1
+            self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.users.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.users),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else None,
+            }
+
+
+user_cache = UserCache()
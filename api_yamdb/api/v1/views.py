@@ -1,30 +1,44 @@
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, serializers, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Genre, Review, Title
+from reviews.leaderboards import get_top_title_ids
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.outbox import enqueue_email
+from reviews.ratings import SCORE_COUNT_FIELD, SCORES, get_prior_mean
+from .authentication import RoleAccessToken
+from .autocomplete import autocomplete_index
+from .bulk import BulkCreateMixin
+from .cache import CachedListMixin, CachedRetrieveMixin, get_stats
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
 from .filters import TitleFilter
+from .pagination import CursorOptInPagination, EstimatedCountPagination
 from .permissions import (
     IsAdminOrReadOnly, IsAdminRole, IsOwnerOrReadOnly
 )
 from .serializers import (
-    CategorySerializer, CommentSerializer,
-    GenreSerializer, ReviewSerializer,
-    SignupSerializer, TitleWriteSerializer,
+    AutocompleteQuerySerializer, CategorySerializer, CommentSerializer,
+    GenreSerializer, LeaderboardQuerySerializer, ReviewSerializer,
+    SignupSerializer, TitleDetailSerializer, TitleWriteSerializer,
     TitleReadSerializer, TokenObtainSerializer,
     UserSerializer
 )
-from .viewsets import CategoryGenreViewSet
+from .throttling import (
+    SignupEmailThrottle, SignupIPThrottle, TokenIPThrottle,
+    TokenUsernameThrottle, claim_resend_slot
+)
+from .user_cache import user_cache
+from .viewsets import (
+    CategoryGenreViewSet, MultiGetMixin, NestedViewSetMixin, SparseFieldsMixin
+)
 
 
 User = get_user_model()
@@ -32,6 +46,8 @@ User = get_user_model()
 
 class SignupView(APIView):
     """Отправка кода подтверждения на почту"""
+    throttle_classes = (SignupIPThrottle, SignupEmailThrottle)
+
     def post(self, request):
         serializer = SignupSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -39,21 +55,21 @@ class SignupView(APIView):
         email = serializer.validated_data.get('email')
         user = User.objects.get_or_create(username=username, email=email)[0]
 
-        confirmation_code = default_token_generator.make_token(user)
-
-        send_mail(
-            subject='Код подтверждения YaMDb',
-            message=f'Ваш код подтверждения: {confirmation_code}',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
+        if claim_resend_slot(email):
+            confirmation_code = default_token_generator.make_token(user)
+            enqueue_email(
+                recipient=email,
+                subject='Код подтверждения YaMDb',
+                body=f'Ваш код подтверждения: {confirmation_code}',
+            )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class TokenObtainView(APIView):
     """Получение JWT-токена путем предоставления confirmation_code"""
+    throttle_classes = (TokenIPThrottle, TokenUsernameThrottle)
+
     def post(self, request):
         serializer = TokenObtainSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -68,15 +84,42 @@ class TokenObtainView(APIView):
                 'confirmation_code': 'Неверный код подтверждения'
             })
 
-        token = AccessToken.for_user(user)
+        token = RoleAccessToken.for_user(user)
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class AutocompleteView(APIView):
+    """Подсказки по началу названий произведений, жанров и категорий"""
+
+    def get(self, request):
+        serializer = AutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            autocomplete_index.search(
+                serializer.validated_data['q'],
+                serializer.validated_data['limit'],
+                serializer.validated_data.get('type')
+            ),
+            status=status.HTTP_200_OK
+        )
+
+
+class ResponseCacheStatsView(APIView):
+    """Статистика попаданий в кеши ответов и пользователей"""
+    permission_classes = (IsAdminRole,)
+
+    def get(self, request):
+        return Response(
+            {**get_stats(), 'users': user_cache.stats()},
+            status=status.HTTP_200_OK
+        )
+
+
+class UserViewSet(BulkCreateMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """Представление юзеров"""
     queryset = User.objects.all().order_by('username')
     serializer_class = UserSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = EstimatedCountPagination
     lookup_field = 'username'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
@@ -90,7 +133,9 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(permissions.IsAuthenticated,)
     )
     def me(self, request):
-        user = request.user
+        user = user_cache.get(request.user.pk)
+        if user is None:
+            raise NotFound
         if request.method == 'GET':
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -101,61 +146,126 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(CategoryGenreViewSet):
+class CategoryViewSet(CachedListMixin, CategoryGenreViewSet):
     """Представление категорий"""
+    cache_tags = ('categories',)
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
 
-class GenreViewSet(CategoryGenreViewSet):
+class GenreViewSet(CachedListMixin, CategoryGenreViewSet):
     """Представление жанров"""
+    cache_tags = ('genres',)
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    CachedListMixin, CachedRetrieveMixin,
+    ConditionalListMixin, ConditionalRetrieveMixin,
+    BulkCreateMixin, MultiGetMixin, SparseFieldsMixin, viewsets.ModelViewSet
+):
     """Представление произведений"""
+    field_sources = {
+        'bayesian_rating': ('rating_sum', 'rating_count'),
+        'score_histogram': tuple(
+            SCORE_COUNT_FIELD.format(score) for score in SCORES
+        ),
+    }
+    cache_tags = ('titles',)
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('id')
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('id')
+    pagination_class = EstimatedCountPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (IsAdminOrReadOnly,)
 
+    def get_extra_versions(self):
+        """Байесовский рейтинг зависит от средней оценки всего каталога."""
+        fields = self.get_sparse_fields()
+        if fields is not None and 'bayesian_rating' not in fields:
+            return ()
+        return (get_prior_mean(),)
+
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
+        if self.action in ('list', 'top'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(detail=False, methods=('get',))
+    def top(self, request):
+        """Лучшие произведения из заранее посчитанных таблиц лидеров"""
+        query = LeaderboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        title_ids = get_top_title_ids(**query.validated_data)
+        titles = self.get_queryset().in_bulk(title_ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in title_ids if pk in titles], many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def get_bulk_response_data(self, objects):
+        """Созданные произведения с жанрами, загруженными одним запросом."""
+        titles = self.get_queryset().in_bulk([title.pk for title in objects])
+        return TitleDetailSerializer(
+            [titles[title.pk] for title in objects], many=True,
+            context=self.get_serializer_context()
+        ).data
+
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    CachedListMixin, CachedRetrieveMixin,
+    ConditionalListMixin, ConditionalRetrieveMixin, NestedViewSetMixin,
+    SparseFieldsMixin, viewsets.ModelViewSet
+):
     """Представление комментов"""
+    cache_tags = ('comments:{review_id}',)
+    queryset = Comment.objects.select_related('author').order_by('id')
     serializer_class = CommentSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = CursorOptInPagination
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
-
-    def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-
-    def get_queryset(self):
-        return self.get_review().comments.all().order_by('id')
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
+    lookups = {'review_id': 'review_id', 'review__title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    CachedListMixin, CachedRetrieveMixin,
+    ConditionalListMixin, ConditionalRetrieveMixin,
+    NestedViewSetMixin, MultiGetMixin, SparseFieldsMixin, viewsets.ModelViewSet
+):
     """Представление ревью"""
+    cache_tags = ('reviews:{title_id}',)
+    queryset = Review.objects.select_related('author').order_by('id')
     serializer_class = ReviewSerializer
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
     permission_classes = [IsOwnerOrReadOnly]
-
-    def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-
-    def get_queryset(self):
-        return self.get_title().reviews.all().order_by('id')
+    pagination_class = CursorOptInPagination
+    parent_model = Title
+    parent_lookups = {'pk': 'title_id'}
+    lookups = {'title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        """Повторный отзыв отсекает ограничение unique_author_title.
+
+        Вставка выполняется сразу, без предварительной проверки, поэтому
+        параллельные запросы не проходят между проверкой и записью.
+        """
+        title = self.get_parent()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставили отзыв на это произведение.'
+                ]
+            })
@@ -1,18 +1,200 @@
-from rest_framework import filters, mixins, pagination, viewsets
+from django.shortcuts import get_object_or_404
+from rest_framework import filters, mixins, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 
+from .bulk import BulkCreateMixin
+from .pagination import EstimatedCountPagination
 from .permissions import IsAdminOrReadOnly
+from .serializers import IdListQuerySerializer
 
 
 class CategoryGenreViewSet(
+    BulkCreateMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin
 ):
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = EstimatedCountPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
     permission_classes = (
         IsAdminOrReadOnly,
     )
+
+
+class NestedViewSetMixin:
+    """Вьюсет объектов, вложенных в родителя из URL.
+
+    Объекты фильтруются по id из URL без загрузки родителя: для
+    детальных действий цепочка проверяется тем же запросом, что ищет
+    объект. Родитель загружается только для списка (чтобы отличить
+    пустой список от 404) и создания — одним запросом по всей цепочке,
+    и запоминается до конца запроса.
+    """
+
+    parent_model = None
+    # Поле родителя или объекта -> аргумент URL.
+    parent_lookups = {}
+    lookups = {}
+
+    def get_parent(self, **annotations):
+        """Родитель из URL; annotations добавляются к первой загрузке."""
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model.objects.annotate(**annotations),
+                **{
+                    field: self.kwargs[kwarg]
+                    for field, kwarg in self.parent_lookups.items()
+                }
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**{
+            field: self.kwargs[kwarg] for field, kwarg in self.lookups.items()
+        })
+
+    def list(self, request, *args, **kwargs):
+        self.get_parent()
+        return super().list(request, *args, **kwargs)
+
+
+class MultiGetMixin:
+    """Список с параметром ?ids=1,2,3 отдает объекты по списку id.
+
+    Объекты загружаются одним запросом и возвращаются в порядке id из
+    запроса, без пагинации; ненайденные id перечисляются в `missing`.
+    Фильтры списка при этом продолжают действовать. Число id ограничено
+    настройкой MULTI_GET_MAX_IDS.
+    """
+
+    def get_requested_ids(self):
+        if 'ids' not in self.request.query_params:
+            return None
+        if not hasattr(self, '_requested_ids'):
+            query = IdListQuerySerializer(data=self.request.query_params)
+            query.is_valid(raise_exception=True)
+            self._requested_ids = query.validated_data['ids']
+        return self._requested_ids
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ids = self.get_requested_ids()
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        if self.get_requested_ids() is not None:
+            return None
+        return super().paginate_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        ids = self.get_requested_ids()
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        objects = {
+            obj.pk: obj
+            for obj in self.filter_queryset(self.get_queryset())
+        }
+        serializer = self.get_serializer(
+            [objects[pk] for pk in ids if pk in objects], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in objects],
+        })
+
+
+def get_param_names(query_params, param):
+    return [
+        name.strip() for name in query_params.get(param, '').split(',')
+        if name.strip()
+    ]
+
+
+class SparseFieldsMixin:
+    """Параметры ?fields=id,name и ?exclude=description для GET-запросов.
+
+    Ненужные поля убираются из ответа, а их колонки — из запроса к БД:
+    колонки откладываются через defer(), а select_related и
+    prefetch_related невостребованных связей отбрасываются. Колонки поля
+    определяются по его source; поля-методы перечисляют свои колонки в
+    `field_sources`.
+    """
+
+    # Поле ответа -> колонки и связи модели, нужные для его значения.
+    field_sources = {}
+
+    def get_sparse_fields(self):
+        """Оставляемые поля ответа или None, если параметров нет."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            params = self.request.query_params
+            fields = get_param_names(params, 'fields')
+            exclude = get_param_names(params, 'exclude')
+            if self.request.method in SAFE_METHODS and (fields or exclude):
+                available = self.get_serializer_class()().fields
+                unknown = [
+                    name for name in fields + exclude if name not in available
+                ]
+                if unknown:
+                    raise ValidationError({
+                        'fields': [f'Неизвестные поля: {", ".join(unknown)}.']
+                    })
+                self._sparse_fields = {
+                    name: field for name, field in available.items()
+                    if (not fields or name in fields) and name not in exclude
+                }
+        return self._sparse_fields
+
+    def get_field_sources(self, fields):
+        """Колонки и связи модели для полей ответа или None, если все."""
+        sources = set()
+        for name, field in fields.items():
+            if name in self.field_sources:
+                sources.update(self.field_sources[name])
+            elif field.source == '*':
+                return None
+            else:
+                sources.add(field.source.split('.')[0])
+        # Дата изменения нужна валидаторам условных запросов.
+        sources.add(getattr(self, 'updated_field', 'pk'))
+        return sources
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        sources = None if fields is None else self.get_field_sources(fields)
+        if sources is None:
+            return queryset
+        related = queryset.query.select_related
+        if isinstance(related, dict):
+            related = [name for name in related if name in sources]
+            queryset = queryset.select_related(None)
+            if related:
+                queryset = queryset.select_related(*related)
+        prefetched = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if lookup.split('__')[0] in sources
+        ]
+        return queryset.prefetch_related(None).prefetch_related(
+            *prefetched
+        ).defer(*(
+            field.name for field in queryset.model._meta.concrete_fields
+            if not field.primary_key and field.name not in sources
+        ))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    del target.fields[name]
+        return serializer
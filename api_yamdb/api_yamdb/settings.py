@@ -16,8 +16,8 @@ ALLOWED_HOSTS = ['*']
 # Application definition
 
 INSTALLED_APPS = [
-    'api.apps.ApiConfig',
     'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -97,7 +97,7 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -109,16 +109,87 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '20/hour',
+        'signup_email': '5/hour',
+        'token_ip': '30/hour',
+        'token_username': '10/hour',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Для общего кеша между процессами без внешних сервисов:
+    # 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    # 'LOCATION': BASE_DIR / 'cache',
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+    },
+    # Для общего хранилища в БД:
+    # 'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+    # 'LOCATION': 'throttle_cache',  # python manage.py createcachetable
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+    },
 }
 
+THROTTLE_CACHE_ALIAS = 'throttle'
+SIGNUP_RESEND_WINDOW = 60
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Выборки больше порога отдают count из кеша вместо COUNT(*)
+EXACT_COUNT_THRESHOLD = 1000
+ESTIMATED_COUNT_TIMEOUT = 60
+
 AUTH_USER_MODEL = 'reviews.User'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'emails'
 
+# Режим доставки писем из очереди: 'thread' — фоновый поток процесса,
+# 'command' — только командой send_emails, 'sync' — в самом запросе.
+EMAIL_DELIVERY_MODE = 'thread'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_LEASE_SECONDS = 300
+
 CONFIRMATION_CODE_LENGTH = 5
 CONFIRMATION_CODE_CHARS = string.digits
 
+# Кеш пользователей процесса для аутентификации
+USER_CACHE_MAX_SIZE = 1000
+USER_CACHE_TIMEOUT = 60
+
+# Подсказки для строки поиска
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_MAX_CANDIDATES = 1000
+AUTOCOMPLETE_REBUILD_INTERVAL = 300
+
+# Таблицы лидеров произведений
+LEADERBOARD_SIZE = 100
+LEADERBOARD_BUFFER = 20
+LEADERBOARD_MIN_REVIEWS = 5
+LEADERBOARD_TIMEOUT = 3600
+LEADERBOARD_LOCK_TIMEOUT = 5
+
+# Байесовский рейтинг: вес средней оценки каталога в отзывах
+RATING_PRIOR_WEIGHT = 10
+RATING_PRIOR_TIMEOUT = 10
+
+# Наибольшее число объектов в одном запросе пакетного создания
+BULK_CREATE_MAX_SIZE = 100
+
+# Наибольшее число id в запросе ?ids=1,2,3
+MULTI_GET_MAX_IDS = 100
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -126,6 +197,8 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
-FORBIDDEN_USERNAMES = ['me',]
+# Совпадают с путями действий вьюсетов: /users/me/, /users/bulk/...
+FORBIDDEN_USERNAMES = ['me', 'bulk']
+FORBIDDEN_SLUGS = ['bulk']
 USERNAME_REGEX = r'^[\w.@+-]+\Z'
 NOREPLY_EMAIL = 'noreply@yamdb.mail.ru'
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (
+    Category, Comment, Genre, OutgoingEmail, Review, Title, User
+)
 
 MAX_DISPLAY_LENGTH = 30
 
@@ -95,4 +97,19 @@ class TitleAdmin(admin.ModelAdmin):
         return ', '.join([genre.name for genre in obj.genre.all()])
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'recipient',
+        'subject',
+        'created_at',
+        'sent_at',
+        'attempts',
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+    ordering = ('-id',)
+
+
 admin.site.empty_value_display = 'Не задано'
@@ -0,0 +1,179 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from reviews.models import Title
+
+VERSION_KEY = 'leaderboard:version'
+BOARD_KEY = 'leaderboard:{version}:{metric}:{scope}'
+# Отметка, что в текущей версии посчитана хотя бы одна таблица.
+BUILT_KEY = 'leaderboard:{version}:built'
+# Блокировка изменения таблицы и отметка, что изменение пропущено.
+LOCK_KEY = '{key}:lock'
+STALE_KEY = '{key}:stale'
+
+METRIC_RATING = 'rating'
+METRIC_REVIEWS = 'reviews'
+METRICS = (METRIC_RATING, METRIC_REVIEWS)
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_leaderboards():
+    """Сбрасывает все таблицы лидеров, например после смены жанров."""
+    cache.set(VERSION_KEY, uuid4().hex, None)
+
+
+def get_scopes(title):
+    """Области, в таблицы которых входит произведение."""
+    scopes = ['all']
+    if title.category_id is not None:
+        scopes.append(f'category:{title.category.slug}')
+    scopes.extend(f'genre:{genre.slug}' for genre in title.genre.all())
+    return scopes
+
+
+def get_scope_filter(scope):
+    if scope.startswith('category:'):
+        return {'category__slug': scope.split(':', 1)[1]}
+    if scope.startswith('genre:'):
+        return {'genre__slug': scope.split(':', 1)[1]}
+    return {}
+
+
+def qualifies(metric, rating_count):
+    if metric == METRIC_RATING:
+        return rating_count >= settings.LEADERBOARD_MIN_REVIEWS
+    return rating_count > 0
+
+
+def sort_key(metric, entry):
+    """Ключ сортировки записи [id, rating, rating_count]."""
+    title_id, rating, rating_count = entry
+    if metric == METRIC_RATING:
+        return (-rating, -title_id)
+    return (-rating_count, -title_id)
+
+
+def build_board(metric, scope):
+    """Считает таблицу по индексированным колонкам рейтинга.
+
+    Хранится на LEADERBOARD_BUFFER записей больше, чем отдается, чтобы
+    падение одного произведения не требовало пересчета.
+    """
+    capacity = settings.LEADERBOARD_SIZE + settings.LEADERBOARD_BUFFER
+    titles = Title.objects.filter(**get_scope_filter(scope))
+    if metric == METRIC_RATING:
+        titles = titles.filter(
+            rating_count__gte=settings.LEADERBOARD_MIN_REVIEWS
+        ).order_by('-rating', '-id')
+    else:
+        titles = titles.filter(rating_count__gt=0).order_by(
+            '-rating_count', '-id'
+        )
+    entries = [
+        list(entry) for entry in titles.values_list(
+            'id', 'rating', 'rating_count'
+        )[:capacity + 1]
+    ]
+    return {
+        'entries': entries[:capacity],
+        'complete': len(entries) <= capacity,
+    }
+
+
+def get_board(metric, scope):
+    version = get_version()
+    key = BOARD_KEY.format(version=version, metric=metric, scope=scope)
+    board = cache.get(key)
+    if board is None:
+        board = build_board(metric, scope)
+        cache.set_many({
+            key: board, BUILT_KEY.format(version=version): True
+        }, settings.LEADERBOARD_TIMEOUT)
+    return board
+
+
+def get_top_title_ids(metric, scope, limit):
+    return [
+        entry[0] for entry in get_board(metric, scope)['entries'][:limit]
+    ]
+
+
+def apply_title_change(board, metric, entry):
+    """Переставляет произведение в таблице после изменения его оценок.
+
+    Возвращает None, если таблицу нужно пересчитать из БД.
+    """
+    entries = [item for item in board['entries'] if item[0] != entry[0]]
+    if qualifies(metric, entry[2]):
+        key = sort_key(metric, entry)
+        # За последней записью неполной таблицы могут быть произведения,
+        # которых в ней нет, поэтому туда вставлять нельзя.
+        if board['complete'] or (
+            entries and key < sort_key(metric, entries[-1])
+        ):
+            entries.append(entry)
+            entries.sort(key=lambda item: sort_key(metric, item))
+    capacity = settings.LEADERBOARD_SIZE + settings.LEADERBOARD_BUFFER
+    complete = board['complete'] and len(entries) <= capacity
+    entries = entries[:capacity]
+    if not complete and len(entries) < settings.LEADERBOARD_SIZE:
+        return None
+    return {'entries': entries, 'complete': complete}
+
+
+def update_board(key, metric, entry):
+    """Переставляет произведение в таблице под блокировкой на cache.add.
+
+    get и set таблицы не атомарны, поэтому одновременно таблицу меняет
+    только держатель блокировки. Если она занята, таблица помечается
+    устаревшей, и держатель, закончив запись, удаляет ее: пропущенное
+    изменение подхватит пересчет из БД.
+    """
+    lock = LOCK_KEY.format(key=key)
+    stale = STALE_KEY.format(key=key)
+    timeout = settings.LEADERBOARD_LOCK_TIMEOUT
+    if not cache.add(lock, True, timeout):
+        cache.set(stale, True, timeout)
+        if not cache.add(lock, True, timeout):
+            return
+    try:
+        board = cache.get(key)
+        if board is not None:
+            board = apply_title_change(board, metric, entry)
+            if board is None:
+                cache.delete(key)
+            else:
+                cache.set(key, board, settings.LEADERBOARD_TIMEOUT)
+    finally:
+        cache.delete(lock)
+    if cache.get(stale):
+        cache.delete_many((key, stale))
+
+
+def update_leaderboards(title_id):
+    """Обновляет уже посчитанные таблицы после изменения отзывов."""
+    version = get_version()
+    if not cache.get(BUILT_KEY.format(version=version)):
+        return
+    title = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).filter(pk=title_id).first()
+    if title is None:
+        return
+    entry = [title.pk, title.rating, title.rating_count]
+    keys = [
+        BOARD_KEY.format(version=version, metric=metric, scope=scope)
+        for scope in get_scopes(title)
+        for metric in METRICS
+    ]
+    for key in cache.get_many(keys):
+        update_board(key, key.split(':')[2], entry)
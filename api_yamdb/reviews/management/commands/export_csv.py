@@ -0,0 +1,182 @@
+import csv
+import gzip
+import os
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def parse_moment(value):
+    """Разбирает дату или дату со временем из аргумента командной строки."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def format_moment(value):
+    return value.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class Command(BaseCommand):
+    help = 'Выгружает данные из базы данных в CSV-файлы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог для CSV-файлов.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, получаемых из БД за один раз.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы в формат .csv.gz.'
+        )
+        parser.add_argument(
+            '--since',
+            type=parse_moment,
+            help='Выгружать отзывы и комментарии начиная с этой даты.'
+        )
+        parser.add_argument(
+            '--until',
+            type=parse_moment,
+            help='Выгружать отзывы и комментарии до этой даты.'
+        )
+
+    def handle(self, *args, **options):
+        self.output_dir = options['output_dir']
+        self.chunk_size = options['chunk_size']
+        self.compress = options['gzip']
+        self.pub_date_filter = {}
+        if options['since']:
+            self.pub_date_filter['pub_date__gte'] = options['since']
+        if options['until']:
+            self.pub_date_filter['pub_date__lt'] = options['until']
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        files_to_methods = [
+            ('users.csv', self.export_users),
+            ('category.csv', self.export_categories),
+            ('genre.csv', self.export_genres),
+            ('titles.csv', self.export_titles),
+            ('review.csv', self.export_reviews),
+            ('comments.csv', self.export_comments),
+            ('genre_title.csv', self.export_genre_titles),
+        ]
+
+        for file_name, method in files_to_methods:
+            self.stdout.write(f'Выгрузка {file_name}...')
+            exported = method(file_name)
+            self.stdout.write(f'Выгружено строк: {exported}')
+
+        self.stdout.write(self.style.SUCCESS('Экспорт успешно завершен!'))
+
+    def open_file(self, file_name):
+        path = os.path.join(self.output_dir, file_name)
+        if self.compress:
+            return gzip.open(
+                f'{path}.gz', 'wt', encoding='utf-8', newline=''
+            )
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    def write_rows(self, file_name, header, queryset, convert=None):
+        """Потоково пишет строки queryset.values_list в CSV файл.
+
+        Строки читаются из БД серверным итератором порциями по
+        chunk_size, поэтому расход памяти не зависит от размера таблицы.
+        """
+        exported = 0
+        try:
+            with self.open_file(file_name) as csv_file:
+                writer = csv.writer(csv_file, lineterminator='\n')
+                writer.writerow(header)
+                for row in queryset.iterator(chunk_size=self.chunk_size):
+                    writer.writerow(convert(row) if convert else row)
+                    exported += 1
+        except OSError as error:
+            raise CommandError(f'Не удалось записать {file_name}: {error}')
+        return exported
+
+    def export_users(self, file_name):
+        fields = (
+            'id', 'username', 'email', 'role', 'bio', 'first_name',
+            'last_name'
+        )
+        return self.write_rows(
+            file_name, fields,
+            User.objects.order_by('id').values_list(*fields)
+        )
+
+    def export_categories(self, file_name):
+        fields = ('id', 'name', 'slug')
+        return self.write_rows(
+            file_name, fields,
+            Category.objects.order_by('id').values_list(*fields)
+        )
+
+    def export_genres(self, file_name):
+        fields = ('id', 'name', 'slug')
+        return self.write_rows(
+            file_name, fields,
+            Genre.objects.order_by('id').values_list(*fields)
+        )
+
+    def export_titles(self, file_name):
+        return self.write_rows(
+            file_name, ('id', 'name', 'year', 'category'),
+            Title.objects.order_by('id').values_list(
+                'id', 'name', 'year', 'category_id'
+            )
+        )
+
+    def export_reviews(self, file_name):
+        return self.write_rows(
+            file_name,
+            ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+            Review.objects.filter(**self.pub_date_filter).order_by(
+                'id'
+            ).values_list(
+                'id', 'title_id', 'text', 'author_id', 'score', 'pub_date'
+            ),
+            lambda row: (*row[:-1], format_moment(row[-1]))
+        )
+
+    def export_comments(self, file_name):
+        return self.write_rows(
+            file_name,
+            ('id', 'review_id', 'text', 'author', 'pub_date'),
+            Comment.objects.filter(**self.pub_date_filter).order_by(
+                'id'
+            ).values_list(
+                'id', 'review_id', 'text', 'author_id', 'pub_date'
+            ),
+            lambda row: (*row[:-1], format_moment(row[-1]))
+        )
+
+    def export_genre_titles(self, file_name):
+        fields = ('id', 'title_id', 'genre_id')
+        return self.write_rows(
+            file_name, fields,
+            Title.genre.through.objects.order_by('id').values_list(*fields)
+        )
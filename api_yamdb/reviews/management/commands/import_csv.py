@@ -1,131 +1,362 @@
 import csv
+import json
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import recalculate_ratings
+from reviews.search import rebuild_index
 
 User = get_user_model()
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 1
+
+# Файл загружается только после всех файлов, от которых он зависит.
+IMPORT_DEPENDENCIES = {
+    'users.csv': (),
+    'category.csv': (),
+    'genre.csv': (),
+    'titles.csv': ('category.csv',),
+    'review.csv': ('users.csv', 'titles.csv'),
+    'genre_title.csv': ('titles.csv', 'genre.csv'),
+    'comments.csv': ('users.csv', 'review.csv'),
+}
+
+
+class OffsetLines:
+    """Итератор по строкам бинарного файла, помнящий смещение в байтах.
+
+    csv.reader забирает ровно столько строк, сколько нужно для записи,
+    поэтому после каждой записи `offset` указывает на начало следующей,
+    в том числе для полей с переводами строк внутри кавычек.
+    """
+
+    def __init__(self, binary_file):
+        self.file = binary_file
+        self.offset = binary_file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+    def seek(self, offset):
+        self.file.seek(offset)
+        self.offset = offset
+
 
 class Command(BaseCommand):
     help = 'Загружает данные из CSV-файлов в базу данных'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной пакетной вставке.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help='Количество файлов, загружаемых одновременно.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help=(
+                'Файл контрольной точки. Если он существует, импорт '
+                'продолжается с сохраненных позиций; после успешного '
+                'импорта файл удаляется.'
+            )
+        )
+
     def handle(self, *args, **options):
-        files_to_methods = [
-            ('users.csv', self.import_users),
-            ('category.csv', self.import_categories),
-            ('genre.csv', self.import_genres),
-            ('titles.csv', self.import_titles),
-            ('review.csv', self.import_reviews),
-            ('comments.csv', self.import_comments),
-            ('genre_title.csv', self.import_genre_titles),
-        ]
-
-        for file_name, method in files_to_methods:
-            self.stdout.write(f'Загрузка {file_name}...')
-            method(file_name)
+        self.batch_size = options['batch_size']
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = self.load_checkpoint()
+        self.lock = threading.Lock()
+        self.known_ids = {}
+        self.offsets = {}
+        self.files_to_methods = {
+            'users.csv': self.import_users,
+            'category.csv': self.import_categories,
+            'genre.csv': self.import_genres,
+            'titles.csv': self.import_titles,
+            'review.csv': self.import_reviews,
+            'comments.csv': self.import_comments,
+            'genre_title.csv': self.import_genre_titles,
+        }
+
+        self.run_graph(options['workers'])
 
+        recalculate_ratings()
+        rebuild_index()
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
         self.stdout.write(self.style.SUCCESS('Импорт успешно завершен!'))
 
-    def get_reader(self, file_name):
-        """Метод открывает путь CSV файла и возвращает DictReader."""
+    def run_graph(self, workers):
+        """Загружает независимые файлы параллельно в пуле потоков."""
+        done = {
+            file_name for file_name, state in self.checkpoint.items()
+            if state.get('done')
+        }
+        pending = set(IMPORT_DEPENDENCIES) - done
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                for file_name in sorted(pending):
+                    if done.issuperset(IMPORT_DEPENDENCIES[file_name]):
+                        pending.discard(file_name)
+                        running[executor.submit(
+                            self.import_file, file_name
+                        )] = file_name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file_name = running.pop(future)
+                    if future.exception() is not None:
+                        raise CommandError(
+                            f'Ошибка при загрузке {file_name}: '
+                            f'{future.exception()}'
+                        ) from future.exception()
+                    done.add(file_name)
+
+    def import_file(self, file_name):
+        self.stdout.write(f'Загрузка {file_name}...')
+        started = time.monotonic()
+        try:
+            imported = self.files_to_methods[file_name](file_name)
+        finally:
+            connections.close_all()
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.save_checkpoint(file_name, done=True)
+        self.stdout.write(
+            f'{file_name}: загружено строк {imported} за {elapsed:.2f} с '
+            f'({imported / elapsed:.0f} строк/с)'
+        )
+
+    def load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(
+            self.checkpoint_path
+        ):
+            return {}
+        with open(self.checkpoint_path, encoding='utf-8') as checkpoint:
+            state = json.load(checkpoint)
+        self.stdout.write(f'Продолжение импорта из {self.checkpoint_path}')
+        return state
+
+    def save_checkpoint(self, file_name, done=False):
+        """Атомарно записывает позицию файла в контрольную точку."""
+        if not self.checkpoint_path:
+            return
+        with self.lock:
+            self.checkpoint[file_name] = {
+                'offset': self.offsets.get(file_name, 0),
+                'done': done,
+            }
+            temporary_path = f'{self.checkpoint_path}.tmp'
+            with open(temporary_path, 'w', encoding='utf-8') as checkpoint:
+                json.dump(self.checkpoint, checkpoint)
+            os.replace(temporary_path, self.checkpoint_path)
+
+    def read_rows(self, file_name):
+        """Построчно читает CSV файл с сохраненной позиции.
+
+        Смещение последней прочитанной записи хранится в `self.offsets`.
+        """
         path = os.path.join(settings.BASE_DIR, 'static', 'data', file_name)
 
         if not os.path.exists(path):
             self.stdout.write(self.style.ERROR(f'Файл не найден: {path}'))
-            return None
+            return
 
-        csv_file = open(path, encoding='utf-8')
-        return csv.DictReader(csv_file)
+        with open(path, 'rb') as csv_file:
+            lines = OffsetLines(csv_file)
+            fieldnames = next(csv.reader(lines))
+            offset = self.checkpoint.get(file_name, {}).get('offset', 0)
+            if offset > lines.offset:
+                lines.seek(offset)
+            for row in csv.DictReader(lines, fieldnames=fieldnames):
+                self.offsets[file_name] = lines.offset
+                yield row
 
-    def import_users(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                row_id = row.pop('id')
-                user, created = User.objects.update_or_create(
-                    id=row_id,
-                    defaults={
-                        'username': row['username'],
-                        'email': row['email'],
-                        'role': row.get('role', 'user'),
-                        'bio': row.get('bio', ''),
-                        'first_name': row.get('first_name', ''),
-                        'last_name': row.get('last_name', ''),
-                    }
+    def get_known_ids(self, model):
+        """Множество id модели, загруженное из БД один раз за импорт."""
+        with self.lock:
+            if model not in self.known_ids:
+                self.known_ids[model] = set(
+                    model.objects.values_list('id', flat=True).iterator()
                 )
+            return self.known_ids[model]
+
+    def check_exists(self, model, object_id, message):
+        if int(object_id) in self.get_known_ids(model):
+            return True
+        self.stdout.write(self.style.ERROR(message))
+        return False
+
+    def get_batches(self, objects):
+        objects = iter(objects)
+        while batch := list(islice(objects, self.batch_size)):
+            yield batch
+
+    def write_batches(self, file_name, objects, save):
+        """Записывает объекты пакетами, отмечая позицию после каждого."""
+        imported = 0
+        for batch in self.get_batches(objects):
+            with transaction.atomic():
+                save(batch)
+            imported += len(batch)
+            self.save_checkpoint(file_name)
+        return imported
+
+    def bulk_import(self, file_name, model, objects, update_fields):
+        """Пакетно вставляет объекты, обновляя уже существующие по id."""
+        known_ids = self.get_known_ids(model)
+
+        def save(batch):
+            model.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=('id',),
+                update_fields=update_fields
+            )
+            known_ids.update(obj.id for obj in batch)
+
+        return self.write_batches(file_name, objects, save)
+
+    def import_users(self, file_name):
+        users = (
+            User(
+                id=int(row['id']),
+                username=row['username'],
+                email=row['email'],
+                role=row.get('role') or User.Role.USER,
+                bio=row.get('bio', ''),
+                first_name=row.get('first_name', ''),
+                last_name=row.get('last_name', ''),
+            )
+            for row in self.read_rows(file_name)
+        )
+        return self.bulk_import(file_name, User, users, (
+            'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+        ))
 
     def import_categories(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                Category.objects.get_or_create(**row)
+        categories = (
+            Category(id=int(row['id']), name=row['name'], slug=row['slug'])
+            for row in self.read_rows(file_name)
+        )
+        return self.bulk_import(
+            file_name, Category, categories, ('name', 'slug')
+        )
 
     def import_genres(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                Genre.objects.get_or_create(**row)
+        genres = (
+            Genre(id=int(row['id']), name=row['name'], slug=row['slug'])
+            for row in self.read_rows(file_name)
+        )
+        return self.bulk_import(
+            file_name, Genre, genres, ('name', 'slug')
+        )
 
     def import_titles(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                row['category_id'] = row.pop('category')
-                Title.objects.get_or_create(**row)
+        titles = (
+            Title(
+                id=int(row['id']),
+                name=row['name'],
+                year=int(row['year']),
+                category_id=int(row['category']),
+            )
+            for row in self.read_rows(file_name)
+            if self.check_exists(
+                Category, row['category'],
+                f'Категория {row["category"]} не найдена!'
+            )
+        )
+        return self.bulk_import(
+            file_name, Title, titles, ('name', 'year', 'category_id')
+        )
 
     def import_reviews(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                if not User.objects.filter(id=row['author']).exists():
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Пользователь {row["author"]} не найден!'
-                        )
-                    )
-                    continue
-                if not Title.objects.filter(id=row['title_id']).exists():
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Произведение {row["title_id"]} не найдено!'
-                        )
-                    )
-                    continue
-
-                row_id = row.pop('id')
-                row['author_id'] = row.pop('author')
-                Review.objects.update_or_create(id=row_id, defaults=row)
+        reviews = (
+            Review(
+                id=int(row['id']),
+                title_id=int(row['title_id']),
+                author_id=int(row['author']),
+                text=row['text'],
+                score=int(row['score']),
+                pub_date=row['pub_date'],
+            )
+            for row in self.read_rows(file_name)
+            if self.check_exists(
+                User, row['author'],
+                f'Пользователь {row["author"]} не найден!'
+            ) and self.check_exists(
+                Title, row['title_id'],
+                f'Произведение {row["title_id"]} не найдено!'
+            )
+        )
+        return self.bulk_import(
+            file_name, Review, reviews,
+            ('title_id', 'author_id', 'text', 'score')
+        )
 
     def import_comments(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                if not User.objects.filter(id=row['author']).exists():
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Пользователь {row["author"]} не найден!'
-                        )
-                    )
-                    continue
-                if not Review.objects.filter(id=row['review_id']).exists():
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Ревью {row["review_id"]} не найдено!'
-                        )
-                    )
-                    continue
-
-                row_id = row.pop('id')
-                row['author_id'] = row.pop('author')
-                Comment.objects.update_or_create(id=row_id, defaults=row)
+        comments = (
+            Comment(
+                id=int(row['id']),
+                review_id=int(row['review_id']),
+                author_id=int(row['author']),
+                text=row['text'],
+                pub_date=row['pub_date'],
+            )
+            for row in self.read_rows(file_name)
+            if self.check_exists(
+                User, row['author'],
+                f'Пользователь {row["author"]} не найден!'
+            ) and self.check_exists(
+                Review, row['review_id'],
+                f'Ревью {row["review_id"]} не найдено!'
+            )
+        )
+        return self.bulk_import(
+            file_name, Comment, comments, ('review_id', 'author_id', 'text')
+        )
 
     def import_genre_titles(self, file_name):
-        reader = self.get_reader(file_name)
-        if reader:
-            for row in reader:
-                title = Title.objects.get(id=row['title_id'])
-                genre = Genre.objects.get(id=row['genre_id'])
-                title.genre.add(genre)
+        """Связи жанров вставляются напрямую в промежуточную таблицу."""
+        through = Title.genre.through
+        links = (
+            through(
+                title_id=int(row['title_id']), genre_id=int(row['genre_id'])
+            )
+            for row in self.read_rows(file_name)
+            if self.check_exists(
+                Title, row['title_id'],
+                f'Произведение {row["title_id"]} не найдено!'
+            ) and self.check_exists(
+                Genre, row['genre_id'],
+                f'Жанр {row["genre_id"]} не найден!'
+            )
+        )
+        return self.write_batches(
+            file_name, links,
+            lambda batch: through.objects.bulk_create(
+                batch, ignore_conflicts=True
+            )
+        )
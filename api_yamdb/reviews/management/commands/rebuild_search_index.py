@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Строит заново полнотекстовый индекс произведений'
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано произведений: {indexed}')
+        )
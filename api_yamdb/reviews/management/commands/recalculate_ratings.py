@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import recalculate_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохраненные рейтинги произведений по отзывам'
+
+    def handle(self, *args, **options):
+        updated = recalculate_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано произведений: {updated}')
+        )
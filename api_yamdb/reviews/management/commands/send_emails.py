@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import deliver_pending, get_outbox_stats
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем, забираемых из очереди за раз.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками очереди в режиме --loop.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending(options['batch_size'])
+            stats = get_outbox_stats()
+            self.stdout.write(
+                f'Отправлено: {sent}, ошибок: {failed}, '
+                f'в очереди: {stats["queued"]}, '
+                f'не доставлено: {stats["failed"]}, '
+                f'средняя задержка: {stats["average_latency"]}'
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
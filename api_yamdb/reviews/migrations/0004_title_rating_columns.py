@@ -0,0 +1,48 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')), 0
+        ),
+        rating=Subquery(
+            reviews.annotate(average=Avg('score')).values('average')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_alter_user_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
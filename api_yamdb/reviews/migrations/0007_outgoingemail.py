@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('subject', models.CharField(max_length=256, verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата постановки в очередь')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Следующая попытка')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Письмо',
+                'verbose_name_plural': 'Очередь писем',
+                'ordering': ('next_attempt_at', 'id'),
+                'indexes': [models.Index(fields=['sent_at', 'next_attempt_at'], name='outgoing_email_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия токенов'),
+        ),
+    ]
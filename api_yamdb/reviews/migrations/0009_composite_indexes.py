@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'id'], name='comment_review_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'id'], name='review_title_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'id'], name='title_category_id_idx'),
+        ),
+        # Промежуточная таблица жанров создается Django автоматически,
+        # поэтому индекс для фильтра по жанру добавляется SQL-запросом.
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX reviews_title_genre_genre_title_idx '
+                'ON reviews_title_genre (genre_id, title_id);'
+            ),
+            reverse_sql='DROP INDEX reviews_title_genre_genre_title_idx;',
+        ),
+    ]
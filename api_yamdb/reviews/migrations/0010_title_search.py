@@ -0,0 +1,60 @@
+from django.db import migrations
+
+CREATE_SEARCH_TABLE = '''
+    CREATE VIRTUAL TABLE reviews_title_search USING fts5(
+        name, description, genres, category,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+'''
+
+# Совпадение в названии важнее совпадения в описании.
+SET_SEARCH_RANK = '''
+    INSERT INTO reviews_title_search (reviews_title_search, rank)
+    VALUES ('rank', 'bm25(10.0, 1.0, 3.0, 3.0)')
+'''
+
+FILL_SEARCH_TABLE = '''
+    INSERT INTO reviews_title_search (rowid, name, description, genres,
+                                      category)
+    SELECT
+        title.id,
+        title.name,
+        title.description,
+        COALESCE((
+            SELECT group_concat(genre.name, ' ')
+            FROM reviews_title_genre AS title_genre
+            INNER JOIN reviews_genre AS genre
+                ON genre.id = title_genre.genre_id
+            WHERE title_genre.title_id = title.id
+        ), ''),
+        COALESCE(category.name, '')
+    FROM reviews_title AS title
+    LEFT JOIN reviews_category AS category
+        ON category.id = title.category_id
+'''
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_SEARCH_TABLE)
+    schema_editor.execute(SET_SEARCH_RANK)
+    schema_editor.execute(FILL_SEARCH_TABLE)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE reviews_title_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating', 'id'], name='title_rating_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_count', 'id'], name='title_rating_count_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'id'], name='title_year_id_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_histograms(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    RatingPrior = apps.get_model('reviews', 'RatingPrior')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(**{
+        f'score_count_{score}': Coalesce(Subquery(
+            reviews.filter(score=score).annotate(
+                total=Count('pk')
+            ).values('total')
+        ), 0)
+        for score in range(1, 11)
+    })
+    RatingPrior.objects.create(pk=1, **Title.objects.aggregate(
+        score_sum=Coalesce(Sum('rating_sum'), 0),
+        score_count=Coalesce(Sum('rating_count'), 0)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_rating_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score_sum', models.PositiveBigIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('score_count', models.PositiveBigIntegerField(default=0, verbose_name='Количество оценок')),
+            ],
+            options={
+                'verbose_name': 'средняя оценка каталога',
+                'verbose_name_plural': 'Средняя оценка каталога',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_1',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «1»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_10',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «10»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_2',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «2»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_3',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «3»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_4',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «4»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_5',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «5»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_6',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «6»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_7',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «7»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_8',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «8»'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_9',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «9»'),
+        ),
+        migrations.RunPython(fill_histograms, migrations.RunPython.noop),
+    ]
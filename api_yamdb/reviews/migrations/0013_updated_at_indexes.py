@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_rating_histogram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'updated_at'], name='comment_review_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'updated_at'], name='review_title_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:47
+
+import reviews.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(unique=True, validators=[reviews.validators.validate_slug_restricted], verbose_name='Слаг'),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='slug',
+            field=models.SlugField(unique=True, validators=[reviews.validators.validate_slug_restricted], verbose_name='Слаг'),
+        ),
+    ]
@@ -1,9 +1,11 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from reviews.validators import (
     unicode_validator,
+    validate_slug_restricted,
     validate_username_restricted,
     validate_year
 )
@@ -61,6 +63,12 @@ class User(AbstractUser):
         blank=True,
     )
 
+    token_version = models.PositiveIntegerField(
+        verbose_name='Версия токенов',
+        default=0,
+        editable=False,
+    )
+
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
@@ -89,6 +97,7 @@ class Genre(models.Model):
     slug = models.SlugField(
         max_length=MAX_SLUG_FIELD_LENGTH,
         unique=True,
+        validators=[validate_slug_restricted],
         verbose_name='Слаг',
     )
 
@@ -108,6 +117,7 @@ class Category(models.Model):
     slug = models.SlugField(
         max_length=MAX_SLUG_FIELD_LENGTH,
         unique=True,
+        validators=[validate_slug_restricted],
         verbose_name='Слаг',
     )
 
@@ -143,16 +153,104 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
+    # Гистограмма оценок: количество отзывов с каждой оценкой.
+    score_count_1 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «1»'
+    )
+    score_count_2 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «2»'
+    )
+    score_count_3 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «3»'
+    )
+    score_count_4 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «4»'
+    )
+    score_count_5 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «5»'
+    )
+    score_count_6 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «6»'
+    )
+    score_count_7 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «7»'
+    )
+    score_count_8 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «8»'
+    )
+    score_count_9 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «9»'
+    )
+    score_count_10 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Оценок «10»'
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
 
     class Meta:
         ordering = ('-year',)
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=('category', 'id'),
+                name='title_category_id_idx'
+            ),
+            models.Index(fields=('rating', 'id'), name='title_rating_id_idx'),
+            models.Index(
+                fields=('rating_count', 'id'),
+                name='title_rating_count_id_idx'
+            ),
+            models.Index(fields=('year', 'id'), name='title_year_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class RatingPrior(models.Model):
+    """Сумма и количество всех оценок каталога.
+
+    Единственная строка служит априорным средним для байесовского
+    рейтинга и обновляется вместе с рейтингами произведений.
+    """
+
+    score_sum = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    score_count = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+
+    class Meta:
+        verbose_name = 'средняя оценка каталога'
+        verbose_name_plural = 'Средняя оценка каталога'
+
+    def __str__(self):
+        return f'{self.score_sum} / {self.score_count}'
+
+
 class Review(models.Model):
     """Модель отзывы."""
 
@@ -177,12 +275,30 @@ class Review(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         default_related_name = 'reviews'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('title', 'id'),
+                name='review_title_id_idx'
+            ),
+            models.Index(
+                fields=('title', 'updated_at'),
+                name='review_title_updated_at_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -213,12 +329,30 @@ class Comment(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=('review', 'id'),
+                name='comment_review_id_idx'
+            ),
+            models.Index(
+                fields=('review', 'updated_at'),
+                name='comment_review_updated_at_idx'
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -226,3 +360,52 @@ class Comment(models.Model):
             f'на отзыв {self.review.author} '
             f'к произведению {self.review.title.name}.'
         )
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=MAX_EMAIL_LENGTH
+    )
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=MAX_NAME_FIELD_LENGTH
+    )
+    body = models.TextField(verbose_name='Текст')
+    created_at = models.DateTimeField(
+        verbose_name='Дата постановки в очередь',
+        auto_now_add=True
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки',
+        default=0
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('next_attempt_at', 'id')
+        indexes = [
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outgoing_email_due_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} для {self.recipient}'
@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Avg, F, Q
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+DELIVERY_SYNC = 'sync'
+DELIVERY_THREAD = 'thread'
+DELIVERY_COMMAND = 'command'
+
+_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def enqueue_email(recipient, subject, body):
+    """Ставит письмо в очередь и запускает доставку по настройке.
+
+    В режиме 'command' письма отправляет только команда send_emails,
+    в режиме 'thread' — фоновый поток после фиксации транзакции,
+    в режиме 'sync' — текущий запрос, и только это письмо.
+    """
+    email = OutgoingEmail.objects.create(
+        recipient=recipient, subject=subject, body=body
+    )
+    mode = settings.EMAIL_DELIVERY_MODE
+    if mode == DELIVERY_SYNC:
+        deliver_pending(email_ids=[email.pk])
+    elif mode == DELIVERY_THREAD:
+        transaction.on_commit(lambda: _executor.submit(_deliver_in_thread))
+    return email
+
+
+def _deliver_in_thread():
+    try:
+        deliver_pending()
+    finally:
+        connection.close()
+
+
+def get_due_emails():
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lte=timezone.now()
+    )
+
+
+def claim_batch(batch_size, email_ids=None):
+    """Забирает пачку писем, откладывая их повторный выбор на время аренды.
+
+    Так несколько воркеров не отправят одно письмо дважды. email_ids
+    ограничивает выбор указанными письмами.
+    """
+    due = get_due_emails()
+    if email_ids is not None:
+        due = due.filter(pk__in=email_ids)
+    with transaction.atomic():
+        emails = list(
+            due.select_for_update(skip_locked=True)[:batch_size]
+        )
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(
+            next_attempt_at=timezone.now() + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS
+            )
+        )
+    return emails
+
+
+def get_retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def send_email(email, mail_connection):
+    """Отправляет одно письмо и записывает результат попытки."""
+    email.attempts += 1
+    try:
+        EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email.recipient],
+            connection=mail_connection,
+        ).send()
+    except Exception as error:
+        email.next_attempt_at = timezone.now() + get_retry_delay(
+            email.attempts
+        )
+        email.last_error = str(error)
+        email.save(update_fields=(
+            'attempts', 'next_attempt_at', 'last_error'
+        ))
+        return False
+    email.sent_at = timezone.now()
+    email.save(update_fields=('attempts', 'sent_at'))
+    return True
+
+
+def deliver_pending(batch_size=None, email_ids=None):
+    """Отправляет накопившиеся письма через одно соединение с сервером.
+
+    email_ids ограничивает отправку указанными письмами. Возвращает
+    количество отправленных и неудавшихся писем.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = failed = 0
+    emails = claim_batch(batch_size, email_ids)
+    if not emails:
+        return sent, failed
+    with get_connection(fail_silently=False) as mail_connection:
+        while emails:
+            for email in emails:
+                if send_email(email, mail_connection):
+                    sent += 1
+                else:
+                    failed += 1
+            emails = claim_batch(batch_size, email_ids)
+    return sent, failed
+
+
+def get_outbox_stats():
+    """Глубина очереди и средняя задержка доставки."""
+    pending = Q(sent_at__isnull=True)
+    return {
+        'queued': OutgoingEmail.objects.filter(
+            pending, attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        ).count(),
+        'failed': OutgoingEmail.objects.filter(
+            pending, attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        ).count(),
+        'average_latency': OutgoingEmail.objects.filter(
+            sent_at__isnull=False
+        ).aggregate(
+            latency=Avg(F('sent_at') - F('created_at'))
+        )['latency'],
+    }
@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, When
+)
+from django.db.models.functions import Cast, Coalesce, Now
+
+from reviews.leaderboards import invalidate_leaderboards
+from reviews.models import MAX_RATING, MIN_RATING, RatingPrior, Review, Title
+
+SCORES = range(MIN_RATING, MAX_RATING + 1)
+SCORE_COUNT_FIELD = 'score_count_{}'
+PRIOR_KEY = 'rating-prior'
+
+
+def update_rating(title_id, added_score=None, removed_score=None):
+    """Атомарно применяет изменение оценок к рейтингу произведения.
+
+    Все выражения вычисляются одним UPDATE по старым значениям колонок,
+    поэтому параллельные отзывы не затирают изменения друг друга.
+    Вместе с рейтингом обновляются гистограмма оценок произведения и
+    средняя оценка каталога.
+    """
+    score_delta = (added_score or 0) - (removed_score or 0)
+    count_delta = (added_score is not None) - (removed_score is not None)
+    histogram = {}
+    if added_score is not None:
+        field = SCORE_COUNT_FIELD.format(added_score)
+        histogram[field] = F(field) + 1
+    if removed_score is not None:
+        field = SCORE_COUNT_FIELD.format(removed_score)
+        histogram[field] = F(field) - 1
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(
+                Q(rating_count__gt=-count_delta),
+                then=Cast(new_sum, FloatField()) / new_count
+            ),
+            default=None,
+            output_field=FloatField()
+        ),
+        updated_at=Now(),
+        **histogram
+    )
+    update_prior(score_delta, count_delta)
+
+
+def update_prior(score_delta, count_delta):
+    updated = RatingPrior.objects.filter(pk=1).update(
+        score_sum=F('score_sum') + score_delta,
+        score_count=F('score_count') + count_delta
+    )
+    if not updated:
+        recalculate_prior()
+
+
+def recalculate_prior():
+    """Пересчитывает среднюю оценку каталога по сохраненным рейтингам."""
+    totals = Title.objects.aggregate(
+        score_sum=Coalesce(Sum('rating_sum'), 0),
+        score_count=Coalesce(Sum('rating_count'), 0)
+    )
+    RatingPrior.objects.update_or_create(pk=1, defaults=totals)
+    cache.delete(PRIOR_KEY)
+
+
+def get_prior_mean():
+    """Средняя оценка каталога, закешированная на RATING_PRIOR_TIMEOUT.
+
+    Она меняется медленно, поэтому чтение раз в несколько секунд не
+    влияет на байесовский рейтинг заметно.
+    """
+    mean = cache.get(PRIOR_KEY)
+    if mean is None:
+        prior = RatingPrior.objects.filter(pk=1).first()
+        if prior is None or not prior.score_count:
+            return None
+        mean = prior.score_sum / prior.score_count
+        cache.set(PRIOR_KEY, mean, settings.RATING_PRIOR_TIMEOUT)
+    return mean
+
+
+def get_bayesian_rating(title, prior_mean):
+    """Среднее оценок, сдвинутое к средней по каталогу.
+
+    Вес априорного среднего равен RATING_PRIOR_WEIGHT отзывам, поэтому
+    одна высокая оценка не поднимает произведение выше сотен отзывов.
+    """
+    if not title.rating_count or prior_mean is None:
+        return None
+    weight = settings.RATING_PRIOR_WEIGHT
+    return (weight * prior_mean + title.rating_sum) / (
+        weight + title.rating_count
+    )
+
+
+def get_histogram(title):
+    return {
+        str(score): getattr(title, SCORE_COUNT_FIELD.format(score))
+        for score in SCORES
+    }
+
+
+def recalculate_ratings(queryset=None):
+    """Пересчитывает сохраненные рейтинги по таблице отзывов."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    histogram = {
+        SCORE_COUNT_FIELD.format(score): Coalesce(Subquery(
+            reviews.filter(score=score).annotate(
+                total=Count('pk')
+            ).values('total')
+        ), 0)
+        for score in SCORES
+    }
+    updated = queryset.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')), 0
+        ),
+        rating=Subquery(
+            reviews.annotate(average=Avg('score')).values('average')
+        ),
+        updated_at=Now(),
+        **histogram
+    )
+    recalculate_prior()
+    invalidate_leaderboards()
+    return updated
@@ -0,0 +1,100 @@
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+SEARCH_TABLE = 'reviews_title_search'
+MAX_SEARCH_WORDS = 10
+
+# Документ индекса собирается из произведения, его жанров и категории.
+INDEX_TITLES_SQL = f'''
+    INSERT INTO {SEARCH_TABLE} (rowid, name, description, genres, category)
+    SELECT
+        title.id,
+        title.name,
+        title.description,
+        COALESCE((
+            SELECT group_concat(genre.name, ' ')
+            FROM reviews_title_genre AS title_genre
+            INNER JOIN reviews_genre AS genre
+                ON genre.id = title_genre.genre_id
+            WHERE title_genre.title_id = title.id
+        ), ''),
+        COALESCE(category.name, '')
+    FROM reviews_title AS title
+    LEFT JOIN reviews_category AS category
+        ON category.id = title.category_id
+'''
+
+
+def is_available():
+    """Полнотекстовый индекс FTS5 есть только в SQLite."""
+    return connection.vendor == 'sqlite'
+
+
+def index_titles(titles):
+    """Перестраивает записи индекса для произведений из queryset."""
+    if not is_available():
+        return
+    try:
+        subquery, params = titles.values('pk').query.sql_with_params()
+    except EmptyResultSet:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({subquery})', params
+        )
+        cursor.execute(
+            f'{INDEX_TITLES_SQL} WHERE title.id IN ({subquery})', params
+        )
+
+
+def unindex_titles(title_ids):
+    """Удаляет записи индекса по id уже удаленных произведений."""
+    if not is_available() or not title_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(title_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})',
+            list(title_ids)
+        )
+
+
+def rebuild_index():
+    """Строит индекс заново по всем произведениям."""
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(INDEX_TITLES_SQL)
+        return cursor.rowcount
+
+
+def build_match_query(text):
+    """Запрос FTS5, где каждое слово ищется как префикс."""
+    words = re.findall(r'\w+', text)[:MAX_SEARCH_WORDS]
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_titles(queryset, text):
+    """Оставляет произведения, найденные по тексту, в порядке релевантности.
+
+    Без FTS5 поиск сводится к вхождению подстроки в название.
+    """
+    match_query = build_match_query(text)
+    if not match_query:
+        return queryset
+    if not is_available():
+        return queryset.filter(name__icontains=text)
+    title_table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = {title_table}.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match_query],
+        select={'search_rank': f'{SEARCH_TABLE}.rank'},
+        order_by=['search_rank', 'id'],
+    )
@@ -0,0 +1,195 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.db import transaction
+from django.db.models import QuerySet
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from reviews.leaderboards import invalidate_leaderboards, update_leaderboards
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.ratings import update_rating
+from reviews.search import index_titles, unindex_titles
+
+# Отправляется после bulk_create, который не вызывает post_save:
+# sender — модель, objects — созданные объекты с id.
+bulk_created = Signal()
+
+
+def touch_titles(titles):
+    """Обновляет дату изменения произведений, чье представление изменилось."""
+    titles.update(updated_at=timezone.now())
+
+
+def refresh_titles(titles):
+    """Отмечает изменение произведений и обновляет их в поисковом индексе."""
+    touch_titles(titles)
+    index_titles(titles)
+
+
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, raw=False, **kwargs):
+    """Отзывает выданные токены при смене роли или блокировке.
+
+    Заодно запоминает, сменилось ли имя пользователя: оно выводится в
+    отзывах и комментариях.
+    """
+    instance._username_changed = False
+    if raw or instance.pk is None:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(
+        'role', 'is_superuser', 'is_active', 'token_version', 'username'
+    ).first()
+    if previous is None:
+        return
+    instance._username_changed = previous['username'] != instance.username
+    if any(
+        previous[field] != getattr(instance, field)
+        for field in ('role', 'is_superuser', 'is_active')
+    ):
+        instance.token_version = previous['token_version'] + 1
+
+
+@receiver(post_save, sender=User)
+def touch_renamed_author_content(sender, instance, created, raw=False,
+                                 **kwargs):
+    """Сдвигает даты изменения отзывов и комментариев автора.
+
+    По ним строятся ETag и Last-Modified, а в ответах выводится имя.
+    """
+    if created or raw or not getattr(instance, '_username_changed', False):
+        return
+    now = timezone.now()
+    Review.objects.filter(author=instance).update(updated_at=now)
+    Comment.objects.filter(author=instance).update(updated_at=now)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, **kwargs):
+    """Запоминает прежнюю оценку, чтобы применить к рейтингу разницу."""
+    instance._previous_score = None
+    if instance.pk is not None:
+        instance._previous_score = Review.objects.filter(
+            pk=instance.pk
+        ).values_list('score', flat=True).first()
+
+
+@receiver(post_save, sender=Review)
+def apply_review_score(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_score = getattr(instance, '_previous_score', None)
+    if created:
+        update_rating(instance.title_id, added_score=instance.score)
+    elif previous_score is not None and previous_score != instance.score:
+        update_rating(
+            instance.title_id,
+            added_score=instance.score,
+            removed_score=previous_score
+        )
+    else:
+        return
+    title_id = instance.title_id
+    transaction.on_commit(lambda: update_leaderboards(title_id))
+
+
+@receiver(post_delete, sender=Review)
+def revert_review_score(sender, instance, **kwargs):
+    update_rating(instance.title_id, removed_score=instance.score)
+    title_id = instance.title_id
+    transaction.on_commit(lambda: update_leaderboards(title_id))
+
+
+@receiver(post_delete, sender=Comment)
+def touch_review_on_comment_delete(sender, instance, origin=None, **kwargs):
+    """Сдвигает дату изменения отзыва при удалении комментария.
+
+    По ней строится ETag списка комментариев. При удалении самого отзыва
+    или его произведения обновлять нечего.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if model not in (Review, Title):
+        Review.objects.filter(pk=instance.review_id).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver((post_save, post_delete), sender=Title)
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Genre)
+@receiver(m2m_changed, sender=Title.genre.through)
+def reset_leaderboards(sender, **kwargs):
+    """Состав таблиц лидеров зависит от категорий и жанров."""
+    invalidate_leaderboards()
+
+
+@receiver(post_save, sender=Title)
+def index_saved_title(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_titles(Title.objects.filter(pk=instance.pk))
+
+
+@receiver(bulk_created, sender=Title)
+def index_created_titles(sender, objects, **kwargs):
+    index_titles(Title.objects.filter(pk__in=[title.pk for title in objects]))
+
+
+@receiver(post_delete, sender=Title)
+def unindex_deleted_title(sender, instance, **kwargs):
+    # Строки произведения уже нет, поэтому запись удаляется по rowid.
+    unindex_titles([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def touch_category_titles(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_titles(Title.objects.filter(category=instance))
+
+
+@receiver(pre_delete, sender=Category)
+def touch_titles_before_category_delete(sender, instance, **kwargs):
+    titles = Title.objects.filter(category=instance)
+    instance._title_ids = list(titles.values_list('pk', flat=True))
+    touch_titles(titles)
+
+
+@receiver(post_save, sender=Genre)
+def touch_genre_titles(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(pre_delete, sender=Genre)
+def touch_titles_before_genre_delete(sender, instance, **kwargs):
+    titles = Title.objects.filter(genre=instance)
+    instance._title_ids = list(titles.values_list('pk', flat=True))
+    touch_titles(titles)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def index_titles_after_delete(sender, instance, **kwargs):
+    """Убирает удаленные категорию или жанр из документов индекса."""
+    index_titles(Title.objects.filter(pk__in=instance._title_ids))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genre_change(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if action in ('post_add', 'post_remove'):
+        if reverse:
+            refresh_titles(Title.objects.filter(pk__in=pk_set))
+        else:
+            refresh_titles(Title.objects.filter(pk=instance.pk))
+    elif action == 'pre_clear':
+        if reverse:
+            titles = Title.objects.filter(genre=instance)
+            instance._title_ids = list(titles.values_list('pk', flat=True))
+            touch_titles(titles)
+        else:
+            touch_titles(Title.objects.filter(pk=instance.pk))
+    elif action == 'post_clear':
+        if reverse:
+            index_titles(Title.objects.filter(pk__in=instance._title_ids))
+        else:
+            index_titles(Title.objects.filter(pk=instance.pk))
@@ -23,4 +23,12 @@ def validate_username_restricted(value):
         )
 
 
+def validate_slug_restricted(value):
+    """Проверка, что слаг не совпадает с путем действия вьюсета."""
+    if value in settings.FORBIDDEN_SLUGS:
+        raise ValidationError(
+            f'Использовать "{value}" в качестве слага запрещено.'
+        )
+
+
 unicode_validator = UnicodeUsernameValidator()
@@ -27,5 +27,7 @@ if FILENAME not in project_dir_content:
     )
 
 pytest_plugins = [
+    'tests.fixtures.fixture_cache',
+    'tests.fixtures.fixture_mail',
     'tests.fixtures.fixture_user',
 ]
@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import caches
+
+from api.v1.autocomplete import autocomplete_index
+from api.v1.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
+    autocomplete_index.clear()
+    yield
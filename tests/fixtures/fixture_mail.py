@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def sync_email_delivery(settings):
+    """Письма отправляются в самом запросе, чтобы их видел mail.outbox."""
+    settings.EMAIL_DELIVERY_MODE = 'sync'
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08StoredRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+
+        review_id = create_single_review(
+            admin_client, title_id, 'Отзыв', 10
+        ).json()['id']
+        create_single_review(user_client, title_id, 'Отзыв', 4)
+        assert admin_client.get(title_url).json()['rating'] == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(title_url).json()['rating'] == 3, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            4, 1, 4.0
+        ), (
+            'Проверьте, что при удалении отзыва его оценка вычитается из '
+            'рейтинга произведения.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отзыв', 6)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            6, 1, 6.0
+        ), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'сохраненный рейтинг по отзывам.'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating is None
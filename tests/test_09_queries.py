@@ -0,0 +1,165 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_comments, create_single_comment,
+                         create_single_review, create_titles)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_list_queries_do_not_grow(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        queries_for_two = count_queries(client, self.TITLES_URL)
+        for idx in range(6):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+            })
+        assert count_queries(client, self.TITLES_URL) == queries_for_two, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от числа произведений на '
+            'странице: категории и жанры должны загружаться заранее.'
+        )
+        assert count_queries(
+            client, f'{self.TITLES_URL}{titles[0]["id"]}/'
+        ) == queries_for_two - 1, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'загружает категорию и жанры произведения без лишних запросов.'
+        )
+
+    def test_02_reviews_and_comments_authors_are_joined(
+            self, admin_client, user_client, moderator_client, client,
+            admin):
+        authors_map = {admin: admin_client}
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        queries_for_reviews = count_queries(client, reviews_url)
+        queries_for_comments = count_queries(client, comments_url)
+
+        for author_client in (user_client, moderator_client):
+            create_single_review(author_client, titles[0]['id'], 'Отзыв', 5)
+            create_single_comment(
+                author_client, titles[0]['id'], reviews[0]['id'], 'Коммент'
+            )
+        assert count_queries(client, reviews_url) == queries_for_reviews, (
+            'Проверьте, что авторы отзывов загружаются одним запросом '
+            'вместе с отзывами.'
+        )
+        assert count_queries(client, comments_url) == queries_for_comments, (
+            'Проверьте, что авторы комментариев загружаются одним запросом '
+            'вместе с комментариями.'
+        )
+
+    def test_03_nested_parents_are_resolved_once(self, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+
+        def count_parent_queries(url, table):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.get(url)
+            assert response.status_code == 200
+            return sum(
+                query['sql'].startswith(f'SELECT "{table}"')
+                for query in context.captured_queries
+            )
+
+        assert count_parent_queries(reviews_url, 'reviews_title') == 1, (
+            'Проверьте, что произведение загружается один раз за запрос к '
+            'списку отзывов.'
+        )
+        assert count_parent_queries(review_url, 'reviews_title') == 0, (
+            'Проверьте, что для отзыва не загружается произведение: '
+            'достаточно фильтра по `title_id`.'
+        )
+        assert count_parent_queries(
+            f'{review_url}comments/', 'reviews_review'
+        ) == 1, (
+            'Проверьте, что отзыв загружается один раз за запрос к списку '
+            'комментариев.'
+        )
+
+        wrong_url = (
+            f'{self.TITLES_URL}{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            f'comments/'
+        )
+        assert admin_client.get(wrong_url).status_code == 404, (
+            'Проверьте, что комментарии недоступны по адресу с чужим '
+            '`title_id`.'
+        )
+        assert admin_client.get(
+            f'{wrong_url}{comments[0]["id"]}/'
+        ).status_code == 404
+        assert admin_client.post(
+            wrong_url, data={'text': 'Коммент'}
+        ).status_code == 404
+
+    def test_04_write_path_query_budget(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        # Первый отзыв прогревает кеш пользователей и средней оценки.
+        create_single_review(admin_client, titles[1]['id'], 'Отзыв', 5)
+        user_client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+
+        def count_post_queries(client, url, data, status):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(url, data=data)
+            assert response.status_code == status
+            return len(context.captured_queries), response.json()
+
+        # Запросы вместе с BEGIN и COMMIT транзакций.
+        budget = {
+            'review': 6,
+            'duplicate_review': 4,
+            'comment': 4,
+            'title': 16,
+        }
+        queries, review = count_post_queries(
+            user_client, reviews_url, {'text': 'Отзыв', 'score': 5}, 201
+        )
+        assert queries <= budget['review'], (
+            f'Проверьте, что POST-запрос к `{reviews_url}` укладывается в '
+            f'{budget["review"]} запросов к БД, сейчас их {queries}.'
+        )
+        queries, _ = count_post_queries(
+            user_client, reviews_url, {'text': 'Отзыв', 'score': 5}, 400
+        )
+        assert queries <= budget['duplicate_review'], (
+            'Проверьте, что повторный отзыв отклоняется по ограничению '
+            'уникальности без предварительной проверки, сейчас '
+            f'{queries} запросов к БД.'
+        )
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        queries, _ = count_post_queries(
+            user_client, comments_url, {'text': 'Коммент'}, 201
+        )
+        assert queries <= budget['comment'], (
+            f'Проверьте, что POST-запрос к `{comments_url}` укладывается в '
+            f'{budget["comment"]} запросов к БД, сейчас их {queries}.'
+        )
+        queries, _ = count_post_queries(admin_client, self.TITLES_URL, {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['horror', 'drama'],
+            'category': 'films',
+        }, 201)
+        assert queries <= budget['title'], (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` укладывается '
+            f'в {budget["title"]} запросов к БД, сейчас их {queries}.'
+        )
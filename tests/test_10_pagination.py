@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Pagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_reviews_cursor_pagination(self, admin_client, client,
+                                          django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for idx in range(15):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title_id=title_id, author=author, text=f'{idx}', score=5
+            )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            f'Проверьте, что без параметра `cursor` эндпоинт `{url}` '
+            'использует постраничную пагинацию.'
+        )
+
+        response = client.get(f'{url}?cursor=')
+        assert response.status_code == HTTPStatus.OK
+        first_page = response.json()
+        assert 'count' not in first_page, (
+            'Проверьте, что курсорная пагинация не считает общее количество '
+            'объектов.'
+        )
+        assert first_page['previous'] is None
+        assert first_page['next']
+
+        second_page = client.get(first_page['next']).json()
+        assert second_page['next'] is None
+        seen_ids = [
+            review['id']
+            for review in first_page['results'] + second_page['results']
+        ]
+        assert seen_ids == list(
+            Review.objects.filter(title_id=title_id).order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        ), (
+            'Проверьте, что курсорная пагинация отдает все отзывы по '
+            'убыванию даты публикации без пропусков и повторов.'
+        )
+
+    def test_02_large_counts_are_served_from_cache(self, admin_client,
+                                                   settings):
+        create_titles(admin_client)
+        data = admin_client.get(self.TITLES_URL).json()
+        assert data['count'] == 2 and data['count_is_estimate'] is False, (
+            f'Проверьте, что для небольших выборок `{self.TITLES_URL}` '
+            'возвращает точный `count` и `count_is_estimate: false`.'
+        )
+
+        settings.EXACT_COUNT_THRESHOLD = 1
+        data = admin_client.get(self.TITLES_URL).json()
+        assert data['count'] == 2 and data['count_is_estimate'] is False
+        data = admin_client.get(self.TITLES_URL).json()
+        assert data['count'] == 2 and data['count_is_estimate'] is True, (
+            'Проверьте, что для больших выборок повторный `count` берется '
+            'из кеша и помечается как приблизительный.'
+        )
+        data = admin_client.get(f'{self.TITLES_URL}?year=1984').json()
+        assert data['count'] == 1 and data['count_is_estimate'] is False, (
+            'Проверьте, что закешированный `count` учитывает фильтры.'
+        )
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.cache import get_tag_versions
+from reviews.models import Review
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_anonymous_responses_are_cached(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?year=1984&name=Т')
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(f'{self.TITLES_URL}?name=Т&year=1984')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный GET-запрос с теми же '
+            'параметрами в другом порядке отдается из кеша.'
+        )
+        assert response.json()['count'] == 1
+
+        response = admin_client.get(self.TITLES_URL)
+        assert 'X-Cache' not in response, (
+            'Проверьте, что ответы авторизованным пользователям не '
+            'кешируются.'
+        )
+
+        stats = admin_client.get(self.STATS_URL).json()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert client.get(self.STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_02_cache_is_invalidated_by_signals(self, admin_client,
+                                                client):
+        titles, _, _ = create_titles(admin_client)
+        first_url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        second_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        for url in (first_url, second_url, self.TITLES_URL):
+            client.get(url)
+
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 8)
+
+        response = client.get(first_url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что новый отзыв сбрасывает кеш списка отзывов '
+            'произведения.'
+        )
+        assert response.json()['count'] == 1
+        assert client.get(second_url)['X-Cache'] == 'HIT', (
+            'Проверьте, что новый отзыв не сбрасывает кеш отзывов других '
+            'произведений.'
+        )
+        response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'MISS'
+        ratings = {
+            title['id']: title['rating'] for title in response.json()['results']
+        }
+        assert ratings[titles[0]['id']] == 8
+
+    def test_03_hit_does_not_query_database(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        for url in (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+        ):
+            etag = client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            assert response['X-Cache'] == 'HIT'
+            assert response['ETag'] == etag, (
+                'Проверьте, что ответ из кеша отдает сохраненный ETag.'
+            )
+            assert len(queries) == 0, (
+                f'Проверьте, что анонимный запрос к `{url}`, попавший в '
+                'кеш, не обращается к БД.'
+            )
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                'Проверьте, что попадание в кеш с актуальным '
+                '`If-None-Match` получает ответ со статусом 304.'
+            )
+            assert len(queries) == 0
+
+    def test_04_invalidation_waits_for_commit(self, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        tag = f'reviews:{titles[0]["id"]}'
+        version = get_tag_versions([tag])
+        with transaction.atomic():
+            Review.objects.create(
+                title_id=titles[0]['id'], author=admin, text='Отзыв', score=5
+            )
+            assert get_tag_versions([tag]) == version, (
+                'Проверьте, что кеш ответов сбрасывается только после '
+                'фиксации транзакции: иначе под новой версией сохранятся '
+                'старые данные.'
+            )
+        assert get_tag_versions([tag]) != version
+
+    def test_05_author_rename_invalidates_cache(self, admin_client,
+                                                user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()['id']
+        create_single_comment(
+            user_client, titles[0]['id'], review_id, 'Комментарий'
+        )
+        urls = (
+            reviews_url, f'{reviews_url}{review_id}/',
+            f'{reviews_url}{review_id}/comments/',
+        )
+        for url in urls:
+            client.get(url)
+
+        user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        for url in urls:
+            response = client.get(url)
+            assert response['X-Cache'] == 'MISS', (
+                f'Проверьте, что смена имени автора сбрасывает кеш `{url}`.'
+            )
+            assert 'renamed' in response.content.decode()
@@ -0,0 +1,165 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_title_validators(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        last_modified = response.get('Last-Modified')
+        assert etag and last_modified, (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит заголовки `ETag` '
+            'и `Last-Modified`.'
+        )
+
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что запрос с актуальным `If-None-Match` получает '
+            'ответ со статусом 304.'
+        )
+        response = user_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение рейтинга произведения меняет его ETag.'
+        )
+        assert response.json()['rating'] == 7
+
+    def test_02_list_etag_changes_on_delete(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()['id']
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = user_client.get(url)['ETag']
+        assert user_client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        user_client.delete(f'{url}{review_id}/')
+        assert user_client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление отзыва меняет ETag списка отзывов.'
+        )
+
+    def test_03_list_validators_without_count(self, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()['id']
+        comments_url = (
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]["id"])}'
+            f'{review_id}/comments/'
+        )
+        comment_id = user_client.post(
+            comments_url, data={'text': 'Комментарий'}
+        ).json()['id']
+
+        for url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]["id"])}'
+            '?cursor=',
+            comments_url,
+            '/api/v1/titles/',
+        ):
+            etag = user_client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+            assert not any(
+                'COUNT' in query['sql'] and 'LIMIT' not in query['sql']
+                for query in queries
+            ), (
+                f'Проверьте, что валидаторы `{url}` не считают COUNT по '
+                'всей выборке.'
+            )
+            if 'reviews' in url:
+                assert len(queries) == 1, (
+                    f'Проверьте, что неизменившийся `{url}` стоит одного '
+                    'запроса родителя.'
+                )
+
+        etag = user_client.get(comments_url)['ETag']
+        user_client.delete(f'{comments_url}{comment_id}/')
+        assert user_client.get(
+            comments_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария меняет ETag списка '
+            'комментариев.'
+        )
+
+    def test_04_list_last_modified_after_delete(self, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.get('/api/v1/titles/')
+        assert response.get('ETag') and 'Last-Modified' not in response, (
+            'Проверьте, что список произведений не отдает `Last-Modified`: '
+            'даты объектов страницы не сдвигаются при удалении.'
+        )
+
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        review_id = create_single_review(
+            user_client, titles[1]['id'], 'Отзыв', 7
+        ).json()['id']
+        # Заголовок точен до секунды: сдвигаем даты в прошлое.
+        hour_ago = timezone.now() - timedelta(hours=1)
+        Title.objects.update(updated_at=hour_ago)
+        Review.objects.update(updated_at=hour_ago)
+        last_modified = user_client.get(url)['Last-Modified']
+        user_client.delete(f'{url}{review_id}/')
+        assert user_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление отзыва сдвигает Last-Modified списка '
+            'отзывов.'
+        )
+
+    def test_05_author_rename_changes_validators(self, admin_client,
+                                                 user_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 7
+        ).json()['id']
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        comment_id = user_client.post(
+            comments_url, data={'text': 'Комментарий'}
+        ).json()['id']
+        urls = (
+            reviews_url, f'{reviews_url}{review_id}/',
+            comments_url, f'{comments_url}{comment_id}/',
+        )
+        etags = {url: admin_client.get(url)['ETag'] for url in urls}
+
+        user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        for url in urls:
+            response = admin_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что смена имени автора меняет ETag `{url}`: '
+                'имя выводится в ответе.'
+            )
+            assert 'renamed' in response.content.decode()
@@ -0,0 +1,66 @@
+import gzip
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review, Title
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = Path(MANAGE_PATH) / 'static' / 'data'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CsvCommands:
+
+    def test_01_import_and_resume(self, tmp_path):
+        call_command('import_csv', batch_size=10, stdout=StringIO())
+        reviews_count = Review.objects.count()
+        assert reviews_count and Comment.objects.exists()
+        assert not Title.objects.filter(
+            reviews__isnull=False, rating__isnull=True
+        ).exists(), (
+            'Проверьте, что после импорта рейтинги произведений пересчитаны.'
+        )
+
+        Review.objects.all().delete()
+        checkpoint = tmp_path / 'checkpoint.json'
+        checkpoint.write_text(json.dumps({
+            file_name: {'offset': 0, 'done': True}
+            for file_name in (
+                'users.csv', 'category.csv', 'genre.csv', 'titles.csv',
+                'genre_title.csv'
+            )
+        }))
+        call_command(
+            'import_csv', checkpoint=str(checkpoint), workers=2,
+            stdout=StringIO()
+        )
+        assert Review.objects.count() == reviews_count, (
+            'Проверьте, что `import_csv --checkpoint` догружает файлы, '
+            'не отмеченные как загруженные.'
+        )
+        assert not checkpoint.exists()
+
+    def test_02_export_mirrors_import(self, tmp_path):
+        call_command('import_csv', stdout=StringIO())
+        call_command('export_csv', output_dir=str(tmp_path), stdout=StringIO())
+        for file_name in ('users.csv', 'category.csv', 'titles.csv'):
+            source = (DATA_DIR / file_name).read_text(encoding='utf-8')
+            exported = (tmp_path / file_name).read_text(encoding='utf-8')
+            assert exported.split() == source.split(), (
+                f'Проверьте, что `export_csv` выгружает {file_name} в том же '
+                'формате, что читает `import_csv`.'
+            )
+
+        call_command(
+            'export_csv', '--since=2100-01-01', output_dir=str(tmp_path),
+            gzip=True, stdout=StringIO()
+        )
+        with gzip.open(tmp_path / 'review.csv.gz', 'rt') as reviews:
+            assert len(reviews.readlines()) == 1, (
+                'Проверьте, что `export_csv --since` отбирает отзывы по дате '
+                'публикации.'
+            )
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+from reviews.models import OutgoingEmail
+from reviews.outbox import _executor, deliver_pending, get_outbox_stats
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+
+    def test_01_signup_only_enqueues_email(self, client, settings):
+        settings.EMAIL_DELIVERY_MODE = 'command'
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что в режиме `command` регистрация не отправляет '
+            'письмо сама, а ставит его в очередь.'
+        )
+        assert get_outbox_stats()['queued'] == 1
+
+        call_command('send_emails', stdout=StringIO())
+        assert [message.to for message in mail.outbox] == [
+            [self.SIGNUP_DATA['email']]
+        ]
+        stats = get_outbox_stats()
+        assert stats['queued'] == 0
+        assert stats['average_latency'] is not None
+
+    def test_02_failed_delivery_is_retried_later(self, client, settings):
+        settings.EMAIL_DELIVERY_MODE = 'command'
+        settings.EMAIL_BACKEND = 'tests.test_14_email_outbox.FailingBackend'
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+
+        assert deliver_pending() == (0, 1)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and email.sent_at is None
+        assert 'SMTP' in email.last_error
+        assert deliver_pending() == (0, 0), (
+            'Проверьте, что письмо после неудачной попытки откладывается '
+            'до следующей попытки.'
+        )
+
+    def test_03_thread_mode_delivers_in_background(self, client, settings):
+        settings.EMAIL_DELIVERY_MODE = 'thread'
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        # Исполнитель однопоточный: пустая задача ждет отправку письма.
+        _executor.submit(lambda: None).result()
+        assert [message.to for message in mail.outbox] == [
+            [self.SIGNUP_DATA['email']]
+        ], (
+            'Проверьте, что в режиме `thread` письмо отправляется фоновым '
+            'потоком после фиксации транзакции.'
+        )
+        assert get_outbox_stats()['queued'] == 0
+
+    def test_04_sync_mode_sends_only_queued_email(self, client, settings):
+        settings.EMAIL_DELIVERY_MODE = 'command'
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+
+        settings.EMAIL_DELIVERY_MODE = 'sync'
+        client.post(self.URL_SIGNUP, data={
+            'email': 'instant@yamdb.fake', 'username': 'instant'
+        })
+        assert [message.to for message in mail.outbox] == [
+            ['instant@yamdb.fake']
+        ], (
+            'Проверьте, что в режиме `sync` запрос отправляет только '
+            'свое письмо, а не всю очередь.'
+        )
+        assert get_outbox_stats()['queued'] == 1
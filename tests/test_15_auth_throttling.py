@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15AuthThrottling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_signup_resend_is_deduplicated(self, client):
+        data = {'email': 'dedup@yamdb.fake', 'username': 'dedup'}
+        for _ in range(3):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что повторные запросы на регистрацию в пределах '
+            '`SIGNUP_RESEND_WINDOW` не отправляют письмо заново.'
+        )
+
+    def test_02_signup_is_throttled_per_email(self, client):
+        data = {'email': 'bot@yamdb.fake', 'username': 'bot'}
+        statuses = [
+            client.post(self.URL_SIGNUP, data=data).status_code
+            for _ in range(6)
+        ]
+        assert statuses[:5] == [HTTPStatus.OK] * 5
+        assert statuses[5] == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что `{self.URL_SIGNUP}` ограничивает число запросов '
+            'для одного email.'
+        )
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'email': 'human@yamdb.fake', 'username': 'human'}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_token_is_throttled_per_username(self, client, user):
+        data = {'username': user.username, 'confirmation_code': '12345'}
+        statuses = [
+            client.post(self.URL_TOKEN, data=data).status_code
+            for _ in range(11)
+        ]
+        assert HTTPStatus.TOO_MANY_REQUESTS not in statuses[:10]
+        assert statuses[10] == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что `{self.URL_TOKEN}` ограничивает подбор кода '
+            'подтверждения для одного пользователя.'
+        )
+
+    def test_04_signup_uniqueness_is_one_query(self, client, user):
+        data = {'email': user.email, 'username': 'other_username'}
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'email' in response.json()
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что занятость `username` и `email` проверяется '
+            'одним запросом к БД.'
+        )
+
+    def test_05_non_object_body_is_bad_request(self, client):
+        for url in (self.URL_SIGNUP, self.URL_TOKEN):
+            for body in ('[1, 2]', '"text"', '5'):
+                response = client.post(
+                    url, data=body, content_type='application/json'
+                )
+                assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                    f'Проверьте, что POST-запрос к `{url}` с телом {body} '
+                    'возвращает 400.'
+                )
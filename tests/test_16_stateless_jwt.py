@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.v1.authentication import RoleAccessToken
+from api.v1.user_cache import user_cache
+
+
+def get_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16StatelessJwt:
+
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_admin_is_authorized_from_token(self, admin, admin_client):
+        client = get_client(admin)
+        client.get(self.USERS_URL)
+        with CaptureQueriesContext(connection) as stateless:
+            response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as legacy:
+            admin_client.get(self.USERS_URL)
+        assert len(stateless) == len(legacy) - 1, (
+            'Проверьте, что для токена с ролью пользователь не загружается '
+            'из БД при каждом запросе.'
+        )
+
+    def test_02_role_change_revokes_token(self, admin, user):
+        client = get_client(user)
+        assert client.get(f'{self.USERS_URL}me/').status_code == HTTPStatus.OK
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.FORBIDDEN
+
+        response = get_client(admin).patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(self.USERS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что смена роли отзывает ранее выданные токены.'
+
+        user.refresh_from_db()
+        assert get_client(user).get(self.USERS_URL).status_code == (
+            HTTPStatus.OK
+        )
+
+    def test_03_me_returns_stored_profile(self, user):
+        response = get_client(user).patch(
+            f'{self.USERS_URL}me/', data={'first_name': 'Имя'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['email'] == user.email and data['bio'] == user.bio, (
+            'Проверьте, что `/users/me/` работает с полным профилем из БД, '
+            'а не с данными токена.'
+        )
+
+    def test_04_rename_is_visible_with_old_token(self, admin_client, user):
+        client = get_client(user)
+        response = client.patch(
+            f'{self.USERS_URL}me/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        title_id = admin_client.post('/api/v1/titles/', data={
+            'name': 'Фильм', 'year': 2000, 'genre': [], 'category': 'films'
+        }).json()['id']
+        response = client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == 'renamed', (
+            'Проверьте, что после смены имени ответы с прежним токеном '
+            'содержат новое имя пользователя.'
+        )
@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.user_cache import user_cache
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17UserCache:
+
+    ME_URL = '/api/v1/users/me/'
+
+    def test_01_legacy_token_user_is_cached(self, user, user_client):
+        user_client.get(self.ME_URL)
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 0, (
+            'Проверьте, что повторный запрос к `/api/v1/users/me/` '
+            'берет пользователя из кеша, а не из БД.'
+        )
+        stats = user_cache.stats()
+        assert stats['hits'] > 0 and stats['size'] == 1
+
+    def test_02_save_invalidates_cached_user(self, admin_client, user,
+                                             user_client):
+        user_client.get(self.ME_URL)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новое о себе'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.ME_URL).json()['bio'] == (
+            'Новое о себе'
+        ), 'Проверьте, что сохранение пользователя сбрасывает его в кеше.'
+
+        user.delete()
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что удаление пользователя сбрасывает его в кеше.'
+
+    @override_settings(USER_CACHE_MAX_SIZE=1)
+    def test_03_cache_is_bounded(self, admin, user):
+        user_cache.get(admin.pk)
+        user_cache.get(user.pk)
+        assert user_cache.stats()['size'] == 1
+        with CaptureQueriesContext(connection) as queries:
+            user_cache.get(admin.pk)
+        assert len(queries) == 1, (
+            'Проверьте, что давно не использованные записи вытесняются из '
+            'кеша пользователей.'
+        )
@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+# Строка плана SQLite для полного прохода по таблице без индекса.
+FULL_SCAN = re.compile(r'^SCAN (?!subquery\b)(\w+)$')
+
+
+def get_full_scans(client, url):
+    """Выполняет EXPLAIN для каждого SELECT запроса к url.
+
+    Возвращает строки планов, в которых таблица читается целиком.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    full_scans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+            full_scans.extend(
+                f'{detail}: {query["sql"]}'
+                for *_, detail in cursor.fetchall()
+                if FULL_SCAN.match(detail)
+            )
+    return full_scans
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Разбор планов написан для SQLite'
+)
+@pytest.mark.django_db(transaction=True)
+class Test18QueryPlans:
+
+    # Списки без фильтров намеренно читаются по первичному ключу с LIMIT,
+    # поэтому проверяются только запросы с фильтром или родителем.
+    URLS = (
+        '/api/v1/titles/?genre=horror',
+        '/api/v1/titles/?category=films',
+        '/api/v1/titles/?year=2000',
+        '/api/v1/titles/?rating_min=5&reviews_min=1',
+        '/api/v1/titles/?ordering=-rating',
+        '/api/v1/titles/?ordering=review_count',
+        '/api/v1/titles/{title_id}/',
+        '/api/v1/titles/?ids={title_id},1000',
+        '/api/v1/titles/{title_id}/reviews/',
+        '/api/v1/titles/{title_id}/reviews/?cursor=',
+        '/api/v1/titles/{title_id}/reviews/?ids={review_id},1000',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/?cursor=',
+    )
+
+    def test_01_endpoints_use_indexes(self, admin, admin_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        for url in self.URLS:
+            url = url.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            )
+            full_scans = get_full_scans(admin_client, url)
+            assert not full_scans, (
+                f'Проверьте, что запросы к `{url}` используют индексы. '
+                f'Полный проход по таблице: {full_scans}'
+            )
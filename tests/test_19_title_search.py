@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.search import SEARCH_TABLE
+from tests.utils import create_titles
+
+
+def search(client, text):
+    response = client.get('/api/v1/titles/', data={'search': text})
+    assert response.status_code == HTTPStatus.OK
+    return [title['id'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_search_by_prefix_and_related_names(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert search(admin_client, 'терм') == [titles[0]['id']], (
+            'Проверьте, что `?search=` находит произведения по началу слова '
+            'в названии без учета регистра.'
+        )
+        assert search(admin_client, 'yippie') == [titles[1]['id']]
+        assert search(admin_client, 'драма') == [titles[1]['id']], (
+            'Проверьте, что поиск учитывает названия жанров.'
+        )
+        assert search(admin_client, 'фильм ужасы') == [titles[0]['id']]
+        assert search(admin_client, 'нет такого') == []
+
+    def test_02_name_matches_rank_first(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Back to the Future',
+            'year': 1985,
+            'genre': ['comedy'],
+            'category': 'films',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert search(admin_client, 'back') == [
+            response.json()['id'], titles[0]['id']
+        ], (
+            'Проверьте, что совпадение в названии ранжируется выше '
+            'совпадения в описании.'
+        )
+
+    def test_03_index_follows_changes(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert search(admin_client, 'терминатор') == []
+        assert search(admin_client, 'чужой') == [titles[0]['id']]
+
+        admin_client.delete('/api/v1/genres/drama/')
+        assert search(admin_client, 'драма') == [], (
+            'Проверьте, что удаление жанра обновляет поисковый индекс.'
+        )
+        admin_client.delete(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        assert search(admin_client, 'орешек') == []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [titles[1]['id']]
+            )
+            assert cursor.fetchone()[0] == 0, (
+                'Проверьте, что удаление произведения удаляет его запись '
+                'из поискового индекса.'
+            )
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.autocomplete import autocomplete_index
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Autocomplete:
+
+    URL = '/api/v1/autocomplete/'
+
+    def test_01_prefix_suggestions(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.URL, data={'q': 'т'})
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.URL, data={'q': 'ор'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [
+            {'type': 'titles', 'name': 'Крепкий орешек',
+             'id': titles[1]['id']},
+        ], (
+            'Проверьте, что `/api/v1/autocomplete/` находит названия по '
+            'началу любого слова.'
+        )
+        assert len(queries) == 0, (
+            'Проверьте, что подсказки отдаются из индекса в памяти без '
+            'запросов к БД.'
+        )
+
+        response = client.get(self.URL, data={'q': 'к'})
+        assert [item['name'] for item in response.json()] == [
+            'Книги', 'Комедия', 'Крепкий орешек'
+        ], (
+            'Проверьте, что выше стоят названия, начинающиеся с запроса, '
+            'и более короткие названия.'
+        )
+        response = client.get(self.URL, data={'q': 'к', 'type': 'genres'})
+        assert response.json() == [
+            {'type': 'genres', 'name': 'Комедия', 'slug': 'comedy'}
+        ]
+        response = client.get(self.URL, data={'q': 'к', 'limit': 1})
+        assert len(response.json()) == 1
+
+    def test_02_index_follows_changes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        assert client.get(self.URL, data={'q': 'терм'}).json()
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert client.get(self.URL, data={'q': 'терм'}).json() == []
+        assert client.get(self.URL, data={'q': 'чуж'}).json() == [
+            {'type': 'titles', 'name': 'Чужой', 'id': titles[0]['id']}
+        ], 'Проверьте, что индекс подсказок обновляется при сохранении.'
+
+        admin_client.delete('/api/v1/genres/drama/')
+        assert client.get(self.URL, data={'q': 'драма'}).json() == [], (
+            'Проверьте, что удаленные объекты пропадают из подсказок.'
+        )
+
+    def test_03_invalid_query(self, client):
+        assert client.get(self.URL).status_code == HTTPStatus.BAD_REQUEST
+        assert client.get(
+            self.URL, data={'q': 'a', 'type': 'users'}
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_type_filter_before_candidate_limit(self, admin_client,
+                                                   client, settings):
+        create_titles(admin_client)
+        settings.AUTOCOMPLETE_MAX_CANDIDATES = 1
+        response = client.get(self.URL, data={'q': 'к', 'type': 'genres'})
+        assert response.json() == [
+            {'type': 'genres', 'name': 'Комедия', 'slug': 'comedy'}
+        ], (
+            'Проверьте, что ограничение AUTOCOMPLETE_MAX_CANDIDATES '
+            'применяется после фильтра по типу.'
+        )
+
+    def test_05_stale_index_is_rebuilt_in_background(self, admin_client,
+                                                      client, settings):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.URL, data={'q': 'т'})
+        # Изменение из другого процесса: сигналы этого процесса не срабатывают.
+        Title.objects.filter(pk=titles[0]['id']).update(name='Чужой')
+        settings.AUTOCOMPLETE_REBUILD_INTERVAL = 0
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.URL, data={'q': 'терм'})
+        assert response.json(), (
+            'Проверьте, что во время пересборки подсказки отдаются из '
+            'прежнего индекса.'
+        )
+        assert len(queries) == 0, (
+            'Проверьте, что устаревший индекс пересобирается не в потоке '
+            'запроса.'
+        )
+        autocomplete_index.rebuild.result()
+        settings.AUTOCOMPLETE_REBUILD_INTERVAL = 300
+        assert client.get(self.URL, data={'q': 'чуж'}).json() == [
+            {'type': 'titles', 'name': 'Чужой', 'id': titles[0]['id']}
+        ]
@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+def get_ids(client, **params):
+    response = client.get('/api/v1/titles/', data=params)
+    assert response.status_code == HTTPStatus.OK
+    return [title['id'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleRatingFilters:
+
+    def test_01_filter_and_order_by_rating(self, admin_client, user_client,
+                                           moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Текст', 4)
+        create_single_review(user_client, first, 'Текст', 6)
+        create_single_review(moderator_client, second, 'Текст', 9)
+
+        assert get_ids(admin_client, rating_min=6) == [second], (
+            'Проверьте, что `rating_min` оставляет произведения с рейтингом '
+            'не ниже заданного.'
+        )
+        assert get_ids(admin_client, rating_max=5) == [first]
+        assert get_ids(admin_client, reviews_min=2) == [first]
+        assert get_ids(admin_client, ordering='-rating') == [second, first], (
+            'Проверьте, что `?ordering=-rating` сортирует произведения по '
+            'убыванию рейтинга.'
+        )
+        assert get_ids(admin_client, ordering='-review_count') == [
+            first, second
+        ]
+        assert get_ids(admin_client, ordering='-year') == [second, first]
+        response = admin_client.get(f'/api/v1/titles/{first}/')
+        assert response.json()['review_count'] == 2
+
+    def test_02_invalid_ordering(self, admin_client):
+        response = admin_client.get(
+            '/api/v1/titles/', data={'ordering': 'description'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
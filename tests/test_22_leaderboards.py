@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.leaderboards import (
+    BOARD_KEY, LOCK_KEY, METRIC_RATING, get_version, update_board
+)
+from tests.utils import create_single_review, create_titles
+
+
+def get_top(client, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/api/v1/titles/top/', data=params)
+    assert response.status_code == HTTPStatus.OK
+    return [title['id'] for title in response.json()], len(queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Leaderboards:
+
+    @pytest.fixture(autouse=True)
+    def min_reviews(self, settings):
+        settings.LEADERBOARD_MIN_REVIEWS = 1
+
+    def test_01_top_titles(self, admin_client, user_client,
+                           moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Текст', 4)
+        create_single_review(user_client, first, 'Текст', 6)
+        create_single_review(moderator_client, second, 'Текст', 9)
+
+        assert get_top(client)[0] == [second, first], (
+            'Проверьте, что `/api/v1/titles/top/` возвращает произведения '
+            'по убыванию рейтинга.'
+        )
+        assert get_top(client, by='reviews')[0] == [first, second]
+        assert get_top(client, genre='drama')[0] == [second]
+        assert get_top(client, category='films', limit=1)[0] == [first]
+
+    def test_02_boards_are_updated_incrementally(self, admin_client,
+                                                 user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Текст', 5)
+        review = create_single_review(user_client, second, 'Текст', 4)
+
+        get_top(client)
+        ids, cached_queries = get_top(client)
+        assert ids == [first, second]
+
+        admin_client.patch(
+            f'/api/v1/titles/{second}/reviews/{review.json()["id"]}/',
+            data={'score': 10}
+        )
+        ids, queries = get_top(client)
+        assert ids == [second, first], (
+            'Проверьте, что изменение оценки обновляет таблицу лидеров.'
+        )
+        assert queries == cached_queries, (
+            'Проверьте, что после изменения отзыва таблица лидеров '
+            'обновляется на месте, а не пересчитывается при чтении.'
+        )
+
+    def test_03_minimum_reviews(self, admin_client, user_client, client,
+                                settings):
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        titles, _, _ = create_titles(admin_client)
+        first = titles[0]['id']
+        create_single_review(admin_client, first, 'Текст', 5)
+        assert get_top(client)[0] == []
+        create_single_review(user_client, first, 'Текст', 7)
+        assert get_top(client)[0] == [first], (
+            'Проверьте, что произведение попадает в рейтинг после '
+            'минимального количества отзывов.'
+        )
+
+    def test_04_concurrent_update_drops_board(self, admin_client,
+                                              user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Текст', 5)
+        create_single_review(user_client, second, 'Текст', 4)
+        assert get_top(client)[0] == [first, second]
+
+        key = BOARD_KEY.format(
+            version=get_version(), metric=METRIC_RATING, scope='all'
+        )
+        # Таблицу в этот момент меняет другой процесс.
+        cache.add(LOCK_KEY.format(key=key), True)
+        create_single_review(admin_client, second, 'Текст', 10)
+        cache.delete(LOCK_KEY.format(key=key))
+        update_board(key, METRIC_RATING, [first, 5.0, 1])
+
+        assert get_top(client)[0] == [second, first], (
+            'Проверьте, что изменение, пропущенное из-за занятой '
+            'блокировки, не теряется: таблица должна быть пересчитана.'
+        )
+
+    def test_05_invalid_query(self, client):
+        response = client.get(
+            '/api/v1/titles/top/', data={'genre': 'drama', 'category': 'films'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
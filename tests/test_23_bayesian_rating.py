@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import RatingPrior, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BayesianRating:
+
+    @pytest.fixture(autouse=True)
+    def prior_weight(self, settings):
+        settings.RATING_PRIOR_WEIGHT = 10
+
+    def create_reviews(self, admin_client, user_client, moderator_client,
+                       user_superuser_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        review = create_single_review(admin_client, first, 'Текст', 10)
+        for client in (user_client, moderator_client, user_superuser_client):
+            create_single_review(client, second, 'Текст', 8)
+        return first, second, review.json()['id']
+
+    def test_01_title_detail(self, admin_client, user_client,
+                             moderator_client, user_superuser_client):
+        first, second, _ = self.create_reviews(
+            admin_client, user_client, moderator_client, user_superuser_client
+        )
+        data = admin_client.get(f'/api/v1/titles/{first}/').json()
+        assert data['rating_average'] == 10.0
+        assert data['bayesian_rating'] == round((10 * 8.5 + 10) / 11, 2), (
+            'Проверьте, что байесовский рейтинг сдвигает среднее оценок к '
+            'средней оценке каталога.'
+        )
+        assert data['score_histogram'] == {
+            str(score): int(score == 10) for score in range(1, 11)
+        }, 'Проверьте, что детальная страница содержит гистограмму оценок.'
+
+        results = admin_client.get('/api/v1/titles/').json()['results']
+        ratings = {title['id']: title['bayesian_rating'] for title in results}
+        assert ratings[second] == round((10 * 8.5 + 24) / 13, 2)
+        assert 'score_histogram' not in results[0]
+
+    def test_02_prior_and_histogram_follow_reviews(
+        self, admin_client, user_client, moderator_client,
+        user_superuser_client
+    ):
+        first, second, review_id = self.create_reviews(
+            admin_client, user_client, moderator_client, user_superuser_client
+        )
+        response = admin_client.delete(
+            f'/api/v1/titles/{first}/reviews/{review_id}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        prior = RatingPrior.objects.get()
+        assert (prior.score_sum, prior.score_count) == (24, 3), (
+            'Проверьте, что средняя оценка каталога обновляется при '
+            'удалении отзыва.'
+        )
+        data = admin_client.get(f'/api/v1/titles/{first}/').json()
+        assert data['bayesian_rating'] is None
+        assert sum(data['score_histogram'].values()) == 0
+
+    def test_03_recalculate_restores_histogram(
+        self, admin_client, user_client, moderator_client,
+        user_superuser_client
+    ):
+        _, second, _ = self.create_reviews(
+            admin_client, user_client, moderator_client, user_superuser_client
+        )
+        Title.objects.update(score_count_8=0)
+        RatingPrior.objects.all().delete()
+        call_command('recalculate_ratings')
+        assert Title.objects.get(pk=second).score_count_8 == 3
+        assert RatingPrior.objects.get().score_count == 4
+
+    def test_04_prior_changes_title_etag(
+        self, admin_client, user_client, moderator_client,
+        user_superuser_client, settings
+    ):
+        settings.RATING_PRIOR_TIMEOUT = 0
+        first, second, _ = self.create_reviews(
+            admin_client, user_client, moderator_client, user_superuser_client
+        )
+        url = f'/api/v1/titles/{first}/'
+        response = admin_client.get(url)
+        etag, rating = response['ETag'], response.json()['bayesian_rating']
+
+        review_id = admin_client.get(
+            f'/api/v1/titles/{second}/reviews/'
+        ).json()['results'][0]['id']
+        admin_client.patch(
+            f'/api/v1/titles/{second}/reviews/{review_id}/', data={'score': 1}
+        )
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение средней оценки каталога меняет ETag '
+            'произведения с байесовским рейтингом.'
+        )
+        assert response.json()['bayesian_rating'] != rating
@@ -0,0 +1,160 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, Title
+
+
+def bulk_post(client, url, items):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, data=items, format='json')
+    return response, len(queries)
+
+
+def make_titles(count, genres=('drama', 'comedy')):
+    return [
+        {
+            'name': f'Произведение {number}',
+            'year': 2000 + number,
+            'genre': list(genres),
+            'category': 'films',
+        }
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkCreate:
+
+    def create_catalog(self, client):
+        response, _ = bulk_post(client, '/api/v1/genres/bulk/', [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ])
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос администратора к '
+            '`/api/v1/genres/bulk/` со списком жанров возвращает 201.'
+        )
+        assert response.json() == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ]
+        response, _ = bulk_post(client, '/api/v1/categories/bulk/', [
+            {'name': 'Фильмы', 'slug': 'films'},
+        ])
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_01_bulk_create_titles(self, admin_client, client):
+        self.create_catalog(admin_client)
+        response, small_queries = bulk_post(
+            admin_client, '/api/v1/titles/bulk/', make_titles(2)
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос администратора к '
+            '`/api/v1/titles/bulk/` со списком произведений возвращает 201.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data] == [
+            'Произведение 0', 'Произведение 1'
+        ]
+        assert [genre['slug'] for genre in data[0]['genre']] == [
+            'drama', 'comedy'
+        ]
+        assert Title.genre.through.objects.count() == 4
+
+        _, large_queries = bulk_post(
+            admin_client, '/api/v1/titles/bulk/', make_titles(10)
+        )
+        assert large_queries == small_queries, (
+            'Проверьте, что число запросов пакетного создания не зависит '
+            'от количества произведений в пакете.'
+        )
+        assert Title.objects.count() == 12
+
+        response = client.get('/api/v1/titles/', {'search': 'произведение'})
+        assert response.json()['count'] == 12, (
+            'Проверьте, что созданные пакетом произведения попадают в '
+            'поисковый индекс.'
+        )
+
+    def test_02_errors_are_reported_per_item(self, admin_client):
+        self.create_catalog(admin_client)
+        response, _ = bulk_post(admin_client, '/api/v1/genres/bulk/', [
+            {'name': 'Ужасы', 'slug': 'horror'},
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Снова ужасы', 'slug': 'horror'},
+        ])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'slug' in errors[1] and 'slug' in errors[2], (
+            'Проверьте, что занятый слаг и повтор слага внутри пакета '
+            'возвращаются как ошибки соответствующих элементов.'
+        )
+        assert not Genre.objects.filter(slug='horror').exists(), (
+            'Проверьте, что при ошибке в пакете ничего не записывается.'
+        )
+
+        items = make_titles(2)
+        items[1]['genre'] = ['drama', 'unknown']
+        response, _ = bulk_post(admin_client, '/api/v1/titles/bulk/', items)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()[0] == {}
+        assert 'genre' in response.json()[1]
+        assert not Title.objects.exists()
+
+    def test_03_bulk_limits_and_permissions(self, admin_client, user_client,
+                                            settings):
+        self.create_catalog(admin_client)
+        response, _ = bulk_post(
+            user_client, '/api/v1/titles/bulk/', make_titles(1)
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пакетное создание доступно только '
+            'администратору.'
+        )
+
+        settings.BULK_CREATE_MAX_SIZE = 3
+        response, _ = bulk_post(
+            admin_client, '/api/v1/titles/bulk/', make_titles(4)
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пакет больше BULK_CREATE_MAX_SIZE отклоняется.'
+        )
+        response, _ = bulk_post(admin_client, '/api/v1/titles/bulk/', [])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Title.objects.exists()
+
+    def test_04_bulk_create_users(self, admin_client, admin):
+        response, _ = bulk_post(admin_client, '/api/v1/users/bulk/', [
+            {'username': 'reader', 'email': 'reader@yamdb.fake'},
+            {'username': 'critic', 'email': 'critic@yamdb.fake',
+             'role': 'moderator'},
+        ])
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос администратора к '
+            '`/api/v1/users/bulk/` со списком пользователей возвращает 201.'
+        )
+        assert [user['role'] for user in response.json()] == [
+            'user', 'moderator'
+        ]
+
+        response, _ = bulk_post(admin_client, '/api/v1/users/bulk/', [
+            {'username': 'writer', 'email': admin.email},
+        ])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'email' in response.json()[0]
+
+    def test_05_bulk_is_reserved(self, admin_client):
+        for url, data in (
+            ('/api/v1/users/', {'username': 'bulk', 'email': 'b@yamdb.fake'}),
+            ('/api/v1/categories/', {'name': 'Пакет', 'slug': 'bulk'}),
+            ('/api/v1/genres/', {'name': 'Пакет', 'slug': 'bulk'}),
+        ):
+            response = admin_client.post(url, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` не позволяет занять '
+                'имя или слаг `bulk`, совпадающий с путем `bulk/`.'
+            )
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def multi_get(client, url, ids):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {'ids': ','.join(map(str, ids))})
+    return response, len(queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25MultiGet:
+
+    def test_01_titles_by_ids(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        missing = second + 100
+
+        response, _ = multi_get(
+            client, '/api/v1/titles/', [second, missing, first, second]
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?ids=...` '
+            'возвращает статус 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            second, first
+        ], (
+            'Проверьте, что произведения возвращаются в порядке id из '
+            'запроса, без повторов.'
+        )
+        assert data['missing'] == [missing], (
+            'Проверьте, что ненайденные id перечислены в `missing`.'
+        )
+        assert data['results'][1]['genre'], (
+            'Проверьте, что произведения отдаются с жанрами и категорией.'
+        )
+
+        _, one_queries = multi_get(admin_client, '/api/v1/titles/', [first])
+        _, two_queries = multi_get(
+            admin_client, '/api/v1/titles/', [first, second]
+        )
+        assert one_queries == two_queries, (
+            'Проверьте, что произведения по списку id загружаются '
+            'фиксированным числом запросов.'
+        )
+
+    def test_02_reviews_by_ids(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        own = create_single_review(admin_client, first, 'Текст', 5).json()
+        other = create_single_review(user_client, first, 'Текст', 7).json()
+        foreign = create_single_review(user_client, second, 'Текст', 3).json()
+
+        response, _ = multi_get(
+            admin_client, f'/api/v1/titles/{first}/reviews/',
+            [other['id'], foreign['id'], own['id']]
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [review['id'] for review in data['results']] == [
+            other['id'], own['id']
+        ]
+        assert data['missing'] == [foreign['id']], (
+            'Проверьте, что отзывы другого произведения считаются '
+            'ненайденными.'
+        )
+
+    def test_03_invalid_ids(self, admin_client, client, settings):
+        create_titles(admin_client)
+        response, _ = multi_get(client, '/api/v1/titles/', ['1', 'x'])
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что нечисловой id в `ids` возвращает 400.'
+        )
+
+        for ids in ([99999999999999999999], [0], [1, -2]):
+            response, _ = multi_get(client, '/api/v1/titles/', ids)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что id вне диапазона ключей ({ids}) '
+                'возвращают 400.'
+            )
+
+        settings.MULTI_GET_MAX_IDS = 2
+        response, _ = multi_get(client, '/api/v1/titles/', [1, 2, 3])
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что число id ограничено MULTI_GET_MAX_IDS.'
+        )
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+def get_sparse(client, url, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` с параметрами {params} '
+        'возвращает статус 200.'
+    )
+    return response.json(), [query['sql'] for query in queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SparseFields:
+
+    def test_01_title_fields(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data, queries = get_sparse(
+            admin_client, '/api/v1/titles/', fields='id,name,year,rating'
+        )
+        assert set(data['results'][0]) == {'id', 'name', 'year', 'rating'}, (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert not any('description' in sql for sql in queries), (
+            'Проверьте, что колонки невостребованных полей не загружаются.'
+        )
+        assert not any('reviews_genre' in sql for sql in queries), (
+            'Проверьте, что жанры не подгружаются, если поле `genre` '
+            'не запрошено.'
+        )
+
+        data, _ = get_sparse(
+            admin_client, f'/api/v1/titles/{titles[0]["id"]}/',
+            exclude='description,score_histogram'
+        )
+        assert 'description' not in data and 'score_histogram' not in data
+        assert data['genre'] and data['category'], (
+            'Проверьте, что `?exclude=` убирает только перечисленные поля.'
+        )
+
+    def test_02_unknown_field(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'fields': 'id,unknown'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестное поле в `?fields=` возвращает 400.'
+        )
+
+    def test_03_review_comment_and_user_fields(self, admin, admin_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        data, queries = get_sparse(
+            admin_client, f'/api/v1/titles/{title_id}/reviews/',
+            fields='id,score'
+        )
+        assert set(data['results'][0]) == {'id', 'score'}
+        assert not any('reviews_user' in sql for sql in queries), (
+            'Проверьте, что автор отзыва не загружается, если поле '
+            '`author` не запрошено.'
+        )
+
+        data, _ = get_sparse(
+            admin_client,
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            exclude='author,pub_date'
+        )
+        assert set(data['results'][0]) == {'id', 'text'}
+
+        data, _ = get_sparse(
+            admin_client, '/api/v1/users/', fields='username,role'
+        )
+        assert set(data['results'][0]) == {'username', 'role'}
+        data, _ = get_sparse(admin_client, '/api/v1/users/me/', fields='bio')
+        assert set(data) == {'bio'}